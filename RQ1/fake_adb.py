@@ -0,0 +1,219 @@
+"""
+Fake `adb` that replays recorded uiautomator dumps, for exercising
+ui_driver.py without a phone.
+
+  python ui_driver.py --adb "python fake_adb.py" --packages apks/ ...
+
+A scenario folder (FAKE_ADB_SCENARIO, default ./fake_device) holds one
+screens/<name>.xml dump per screen and scenario.json describing how taps,
+swipes and back presses move between them ("tap:<node text>" → "<screen>
+[+install|+uninstall]"), how long each screen takes to render (dumps show
+screens/loading.xml until then), how long installs take, and per-package
+screen / transition overrides to replay the different outcomes.
+
+Per-device state (current screen, installed packages, /sdcard files) lives
+under FAKE_ADB_STATE/<serial>/ so several fake devices can run in parallel;
+`adb devices` lists scenario["serials"] or FAKE_ADB_DEVICES (comma separated).
+scenario["offline_after"] = {serial: n} makes a device go offline after n
+commands, to replay a crashed phone / emulator.
+
+`exec-out` behaves like `shell` with binary-clean stdout, so
+`exec-out uiautomator dump /dev/tty` and `exec-out screencap -p` stream
+the dump / PNG instead of writing to /sdcard.
+"""
+
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCENARIO_DIR = Path(os.environ.get("FAKE_ADB_SCENARIO", Path(__file__).parent / "fake_device"))
+STATE_DIR = Path(os.environ.get("FAKE_ADB_STATE", Path(tempfile.gettempdir()) / "fake_adb_state"))
+PNG_HEADER = b"\x89PNG\r\n\x1a\n"
+BOUNDS_RE = re.compile(r'text="([^"]*)"[^>]*bounds="\[(\d+),(\d+)\]\[(\d+),(\d+)\]"')
+
+class Device:
+    def __init__(self, scenario, serial):
+        self.scenario = scenario
+        self.root = STATE_DIR / serial
+        self.sdcard = self.root / "sdcard"
+        self.sdcard.mkdir(parents=True, exist_ok=True)
+        self.state_file = self.root / "state.json"
+        if self.state_file.exists():
+            self.state = json.loads(self.state_file.read_text())
+        else:
+            self.state = {"screen": "home", "visible_at": 0, "package": "", "installed": {},
+                          "commands": 0}
+        self.serial = serial
+
+    @property
+    def offline(self):
+        limit = self.scenario.get("offline_after", {}).get(self.serial)
+        return limit is not None and self.state.get("commands", 0) >= limit
+
+    def save(self):
+        self.state_file.write_text(json.dumps(self.state))
+
+    # ── screens ────────────────────────────────────────────────────────
+    def overrides(self):
+        return self.scenario.get("packages", {}).get(self.state["package"], {})
+
+    def goto(self, screen):
+        screen, _, effect = screen.partition(" +")
+        pkg = self.state["package"]
+        if effect == "install":
+            secs = self.scenario["install_seconds"]
+            self.state["installed"][pkg] = time.time() + secs.get(pkg, secs["default"])
+        elif effect == "uninstall":
+            self.state["installed"].pop(pkg, None)
+        screen = self.overrides().get(screen, screen)
+        self.state["screen"] = screen
+        delay = self.scenario.get("render_seconds", {}).get(screen, 0)
+        self.state["visible_at"] = time.time() + delay
+
+    def visible_screen(self):
+        if time.time() < self.state["visible_at"]:
+            return "loading"
+        return self.state["screen"]
+
+    def render(self):
+        xml = (SCENARIO_DIR / "screens" / f"{self.visible_screen()}.xml").read_text(encoding="utf-8")
+        return xml.replace("{package}", self.state["package"])
+
+    def transition(self, key):
+        screen = self.visible_screen()
+        table = dict(self.scenario["transitions"].get(screen, {}))
+        table.update(self.overrides().get("transitions", {}).get(screen, {}))
+        if key in table:
+            self.goto(table[key])
+
+    def tap(self, x, y):
+        hit = None
+        for text, *b in BOUNDS_RE.findall(self.render()):
+            x1, y1, x2, y2 = map(int, b)
+            if x1 <= x <= x2 and y1 <= y <= y2 and text:
+                hit = text  # innermost / last node wins
+        if hit is not None:
+            pkg = self.state["package"]
+            self.transition("tap:" + (hit.replace(pkg, "{package}") if pkg else hit))
+
+    def is_installed(self, pkg):
+        ready = self.state["installed"].get(pkg)
+        return ready is not None and time.time() >= ready
+
+    # ── commands ───────────────────────────────────────────────────────
+    def shell(self, args):
+        cmd = " ".join(args)
+        if args[:2] == ["am", "start"]:
+            uri = args[args.index("-d") + 1] if "-d" in args else ""
+            if uri.startswith("market://details?id="):
+                pkg = uri.split("=", 1)[1]
+                self.state["package"] = pkg
+                if self.is_installed(pkg):
+                    self.goto("store_installed")
+                elif pkg in self.state["installed"]:
+                    self.goto("store_installing")
+                else:
+                    self.goto("store_install")
+            elif uri.startswith("package:"):
+                self.goto("hc_details")
+            print("Starting: Intent { " + cmd + " }")
+        elif args[:2] == ["am", "force-stop"]:
+            pass
+        elif args[:2] == ["input", "tap"]:
+            self.tap(int(float(args[2])), int(float(args[3])))
+        elif args[:2] == ["input", "swipe"]:
+            self.transition("swipe")
+        elif args[:3] == ["input", "keyevent", "4"]:
+            self.transition("back")
+        elif args[:2] == ["uiautomator", "dump"]:
+            path = args[2] if len(args) > 2 else "/sdcard/window_dump.xml"
+            if path == "/dev/tty":
+                sys.stdout.write(self.render())
+            else:
+                self.device_path(path).write_text(self.render(), encoding="utf-8")
+            print(f"UI hierchary dumped to: {path}")
+        elif args[:2] == ["screencap", "-p"]:
+            data = PNG_HEADER + f"{self.visible_screen()}:{self.state['package']}".encode()
+            if len(args) > 2:
+                self.device_path(args[2]).write_bytes(data)
+            else:
+                sys.stdout.flush()
+                sys.stdout.buffer.write(data)
+        elif args[:2] == ["pm", "path"]:
+            if self.is_installed(args[2]):
+                print(f"package:/data/app/{args[2]}/base.apk")
+        elif args[:1] == ["rm"]:
+            for a in args[1:]:
+                if not a.startswith("-"):
+                    self.device_path(a).unlink(missing_ok=True)
+        else:
+            print(f"/system/bin/sh: {args[0]}: not found", file=sys.stderr)
+            return 127
+        return 0
+
+    def device_path(self, path):
+        return self.sdcard / Path(path).name
+
+    def pull(self, src, dst):
+        local = self.device_path(src)
+        if not local.exists():
+            print(f"adb: error: failed to stat remote object '{src}': No such file or directory",
+                  file=sys.stderr)
+            return 1
+        shutil.copyfile(local, dst)
+        print(f"{src}: 1 file pulled.")
+        return 0
+
+    def uninstall(self, pkg):
+        self.state["installed"].pop(pkg, None)
+        print("Success")
+        return 0
+
+def serials(scenario):
+    env = os.environ.get("FAKE_ADB_DEVICES")
+    return env.split(",") if env else scenario.get("serials", ["emulator-5554"])
+
+def main(argv):
+    scenario = json.loads((SCENARIO_DIR / "scenario.json").read_text(encoding="utf-8"))
+    time.sleep(scenario.get("latency_seconds", 0))
+    known = serials(scenario)
+    serial = known[0]
+    if argv[:1] == ["-s"]:
+        serial, argv = argv[1], argv[2:]
+    if argv[:1] == ["devices"]:
+        print("List of devices attached")
+        for s in known:
+            print(f"{s}\t{'offline' if Device(scenario, s).offline else 'device'}")
+        return 0
+    if serial not in known:
+        print(f"adb: device '{serial}' not found", file=sys.stderr)
+        return 1
+
+    device = Device(scenario, serial)
+    if device.offline:
+        print("adb: error: device offline", file=sys.stderr)
+        return 1
+    device.state["commands"] = device.state.get("commands", 0) + 1
+    cmd, args = argv[0], argv[1:]
+    if cmd == "get-state":
+        print("device")
+        rc = 0
+    elif cmd in ("shell", "exec-out"):
+        rc = device.shell(args)
+    elif cmd == "pull":
+        rc = device.pull(args[0], args[1])
+    elif cmd == "uninstall":
+        rc = device.uninstall(args[0])
+    else:
+        print(f"adb: unknown command {cmd}", file=sys.stderr)
+        rc = 1
+    device.save()
+    return rc
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
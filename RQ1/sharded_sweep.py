@@ -0,0 +1,229 @@
+"""
+Multi-device RQ1 sweep: shards the APK queue across every attached device.
+
+Devices/emulators are discovered with `adb devices`. Each gets its own
+ui_driver.Driver, worker thread, dump folder (<dumps>/<serial>/) and log
+(<logs>/<serial>.log); screenshots all land in one folder as before.
+--capture, --no-archive and --ocr behave as in ui_driver.py (the OCR handoffs
+are serialized across devices), and the report CSV carries the same per-app
+adb round-trips / host disk bytes / device temp files columns.
+
+The queue is split round-robin into per-device deques. A device takes from
+the front of its own deque and, once that is empty, steals from the back of
+the fullest other deque, so fast devices pick up a slow one's leftovers.
+When a device goes offline or stops answering (ui_driver.DeviceLost), the
+app it was on is re-queued on another device (up to MAX_ATTEMPTS times) and
+the device's remaining work is handed over. If the device is still up (a
+timed-out command), the app is uninstalled first, since the retry may land
+on the same device.
+
+  python sharded_sweep.py --packages apks/ --dumps dumps/ --screenshots shots/
+  FAKE_ADB_DEVICES=emu-1,emu-2,emu-3 python sharded_sweep.py --adb "python fake_adb.py" ...
+"""
+
+import argparse
+import csv
+import logging
+import shlex
+import subprocess
+import sys
+import threading
+import time
+from collections import deque, Counter
+from pathlib import Path
+from ui_driver import (ADB, CAPTURE, PACKAGE_DIR, DUMP_XML_DIR, SCREENSHOT_DIR, SCRIPT_SLEEPS,
+                       Adb, Driver, DeviceLost, ocr_sink, pending_packages, print_plan,
+                       write_capture_record)
+
+LOG_DIR      = "logs"
+REPORT_CSV   = "sharded_sweep_report.csv"
+MAX_ATTEMPTS = 3   # per app, across devices
+
+def discover_devices(adb_exe):
+    out = subprocess.run(shlex.split(adb_exe) + ["devices"], capture_output=True,
+                         text=True, timeout=30).stdout
+    return [line.split("\t")[0] for line in out.splitlines()[1:]
+            if line.strip().endswith("\tdevice")]
+
+class WorkQueue:
+    """Per-device deques with work stealing and re-queueing."""
+
+    def __init__(self, serials, items):
+        self.cond = threading.Condition()
+        self.queues = {s: deque() for s in serials}
+        for i, item in enumerate(items):
+            self.queues[serials[i % len(serials)]].append(item)
+        self.in_flight = 0
+        self.attempts = Counter()
+        self.failed = []
+
+    def take(self, serial):
+        """Next app for `serial` → (pkg, stolen), or (None, False) when all done."""
+        with self.cond:
+            while True:
+                own = self.queues.get(serial)
+                if own is None:  # device retired
+                    return None, False
+                victim = own if own else max(self.queues.values(), key=len)
+                if victim:
+                    pkg = victim.popleft() if victim is own else victim.pop()
+                    self.in_flight += 1
+                    self.attempts[pkg] += 1
+                    return pkg, victim is not own
+                if self.in_flight == 0:
+                    return None, False
+                self.cond.wait()  # a running app may still be re-queued
+
+    def done(self, pkg=None, serial=None):
+        """Finish the current app; with `pkg`, put it back for another device."""
+        with self.cond:
+            self.in_flight -= 1
+            if pkg is not None:
+                if self.attempts[pkg] >= MAX_ATTEMPTS:
+                    self.failed.append(pkg)
+                else:
+                    self._push(pkg, exclude=serial)
+            self.cond.notify_all()
+
+    def retire(self, serial):
+        """Drop a dead device and hand its queued apps to the others."""
+        with self.cond:
+            for pkg in self.queues.pop(serial, deque()):
+                self._push(pkg)
+            self.cond.notify_all()
+
+    def _push(self, pkg, exclude=None):
+        others = [s for s in self.queues if s != exclude] or list(self.queues)
+        if not others:
+            self.failed.append(pkg)
+            return
+        target = min(others, key=lambda s: len(self.queues[s]))
+        self.queues[target].appendleft(pkg)
+
+def device_logger(serial, log_dir):
+    logger = logging.getLogger(f"rq1.{serial}")
+    logger.setLevel(logging.INFO)
+    handler = logging.FileHandler(Path(log_dir) / f"{serial}.log", encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+    logger.addHandler(handler)
+    return logger
+
+def clean_up(driver, pkg, log):
+    """Best-effort force-stop HC + uninstall after an aborted app."""
+    try:
+        driver.stop_health_connect()
+        driver.uninstall(pkg)
+    except Exception as e:
+        log.error(f"clean-up after {pkg} failed: {e}")
+
+def serialized(sink):
+    """One OCR handoff at a time: the devices share RQ3's easyocr reader."""
+    lock = threading.Lock()
+    def call(*args):
+        with lock:
+            return sink(*args)
+    return call
+
+def run_device(serial, work, args, rows, lock, sink=None):
+    log = device_logger(serial, args.logs)
+    dump_dir = Path(args.dumps) / serial
+    dump_dir.mkdir(parents=True, exist_ok=True)
+    adb = Adb(args.adb, serial)
+    driver = Driver(adb, dump_dir, args.screenshots, log=log.info, capture=args.capture,
+                    archive=not args.no_archive, sink=sink)
+    while True:
+        pkg, stolen = work.take(serial)
+        if pkg is None:
+            break
+        log.info(f"=== Processing package: {pkg}{' (stolen)' if stolen else ''} ===")
+        try:
+            outcome, wall = driver.process(pkg)
+        except DeviceLost as e:
+            log.error(f"{e}; re-queueing {pkg}")
+            print(f"[{serial}] lost while on {pkg}: {e}")
+            alive = adb.alive()
+            if alive:  # only timed out: don't leave the app installed for its retry
+                clean_up(driver, pkg, log)
+            work.done(pkg, serial)
+            if not alive:
+                log.error("device gone, retiring")
+                work.retire(serial)
+                break
+            continue
+        except Exception as e:  # a broken app must not stall the other devices
+            log.exception(f"{pkg} failed: {e}")
+            clean_up(driver, pkg, log)
+            work.done(pkg, serial)
+            continue
+        work.done()
+        write_capture_record(args.packages, args.screenshots, pkg, outcome, driver.archive)
+        log.info(f"=== Done with {pkg}: {outcome} in {wall:.1f}s ===")
+        print(f"[{serial}] {pkg}: {outcome} in {wall:.1f}s")
+        with lock:
+            io = driver.last_io
+            rows.append((pkg, serial, outcome, round(wall, 2), SCRIPT_SLEEPS[outcome],
+                         io["adb_calls"], io["host_bytes"], io["device_files"]))
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Multi-device RQ1 UI sweep")
+    ap.add_argument("--packages", default=PACKAGE_DIR, help="folder of <package>.apk files")
+    ap.add_argument("--dumps", default=DUMP_XML_DIR, help="folder for per-device UI dumps")
+    ap.add_argument("--screenshots", default=SCREENSHOT_DIR, help="folder for screenshots")
+    ap.add_argument("--logs", default=LOG_DIR, help="folder for per-device logs")
+    ap.add_argument("--adb", default=ADB, help="adb command (e.g. 'python fake_adb.py')")
+    ap.add_argument("--devices", help="comma-separated serials (default: all attached)")
+    ap.add_argument("--capture", choices=("stream", "pull"), default=CAPTURE,
+                    help="exec-out into memory, or dump/pull via /sdcard")
+    ap.add_argument("--no-archive", action="store_true",
+                    help="keep screenshots in memory only")
+    ap.add_argument("--ocr", action="store_true",
+                    help="hand policy/permission images to RQ3's OCR stage in-process")
+    ap.add_argument("--dry-run", action="store_true", help="list what would be captured and exit")
+    ap.add_argument("--report", default=REPORT_CSV)
+    args = ap.parse_args(argv)
+
+    if args.dry_run:
+        return print_plan(args.packages, args.screenshots)
+
+    serials = args.devices.split(",") if args.devices else discover_devices(args.adb)
+    if not serials:
+        print("No devices attached")
+        return 1
+    for d in (args.dumps, args.screenshots, args.logs):
+        Path(d).mkdir(parents=True, exist_ok=True)
+    apps = list(pending_packages(args.packages, args.screenshots))
+    print(f"{len(apps)} apps over {len(serials)} devices: {', '.join(serials)}")
+
+    work = WorkQueue(serials, apps)
+    rows, lock = [], threading.Lock()
+    sink = serialized(ocr_sink()) if args.ocr else None
+    start = time.monotonic()
+    threads = [threading.Thread(target=run_device, args=(s, work, args, rows, lock, sink), name=s)
+               for s in serials]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    total = time.monotonic() - start
+
+    with open(args.report, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["package", "serial", "outcome", "wall_s", "script_sleep_s",
+                    "adb_calls", "host_bytes", "device_files"])
+        w.writerows(sorted(rows))
+    per_device = Counter(r[1] for r in rows)
+    print(f"\n{len(rows)}/{len(apps)} apps in {total:.1f}s "
+          f"({len(rows) / max(total, 1e-9) * 60:.1f} apps/min) on {len(serials)} devices")
+    for s in serials:
+        print(f"  {s}: {per_device[s]} apps")
+    if rows:
+        n = len(rows)
+        print(f"per app: {sum(r[5] for r in rows) / n:.1f} adb round-trips, "
+              f"{sum(r[6] for r in rows) / n / 1024:.1f} KiB host disk I/O, "
+              f"{sum(r[7] for r in rows) / n:.1f} device temp files")
+    if work.failed:
+        print(f"Gave up on {len(work.failed)} apps: {', '.join(work.failed)}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,525 @@
+"""
+Event-driven Python port of UI_testing.sh.
+
+Same flow per APK in PACKAGE_DIR:
+  Play Store install → Health Connect → App permissions → <app> →
+  "Read privacy policy" → screenshot → force-stop HC → uninstall
+
+but instead of fixed Start-Sleep calls every step polls `uiautomator dump`
+until its target node appears (or a per-step timeout in TIMEOUTS expires),
+the install waits on `pm path` rather than a 15 s guess, and the policy page
+is captured as soon as its UI hierarchy stops changing.
+
+Dumps and screenshots are streamed over `adb exec-out` straight into memory
+(CAPTURE="stream"): no /sdcard temp file, no pull, no local xml. Each dump
+is parsed once into a Screen. Screenshots are archived to the
+screenshot folder unless --no-archive is set. With --ocr, the permission
+list and the policy page are screenshotted at every scroll position and each
+set goes in-process to the RQ3 OCR stage
+(RQ3_src/llm_analysis.ingest_capture). CAPTURE="pull" keeps the
+script's dump → pull → read round trip for comparison.
+
+Each app's outcome and wall time are written to REPORT_CSV next to the
+fixed-sleep budget UI_testing.sh spends on the same path (SCRIPT_SLEEPS),
+which is a lower bound on the shell script's time for that app. The CSV also
+records adb round-trips, host disk bytes and device temp files per app.
+
+Every capture leaves a screen_<pkg>.json record beside its screenshot: the
+hash of the APK it came from, CAPTURE_FORMAT, the outcome and the
+screenshot's hash. An app is re-captured only when that record is missing
+or stale, e.g. a new APK version was dropped in PACKAGE_DIR or the last run
+ended in a RETRY_OUTCOMES failure (install timeout, no Install button).
+--dry-run lists what would be captured and why. RQ3 does not read these
+records; the only RQ1 → RQ3 link is --ocr, whose ingest_capture stores the
+same sha256 as the first entry of the "capture" input of the app's
+build.pp_segments record.
+
+  python ui_driver.py --packages apks/ --dumps dumps/ --screenshots shots/
+  python ui_driver.py --adb "python fake_adb.py" ...   # replayed device
+  python ui_driver.py --capture pull ...               # old dump/pull path
+  python ui_driver.py --dry-run ...                    # what would be captured
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import re
+import shlex
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+from collections import Counter
+from pathlib import Path
+
+# set your paths / timeouts once up front
+PACKAGE_DIR    = ""  # the folder that saves apk files to get package name
+DUMP_XML_DIR   = ""  # the folder to save the intermediate UI page xml
+SCREENSHOT_DIR = ""  # the folder to save the HC permission rationale display results
+REPORT_CSV     = "ui_driver_report.csv"
+ADB            = "adb"
+CAPTURE        = "stream"  # "stream" (exec-out into memory) or "pull" (/sdcard + adb pull)
+CAPTURE_FORMAT = 1         # bump when a flow change should invalidate existing captures
+
+POLL_INTERVAL = 0.5  # seconds between UI dumps while waiting
+MAX_SWIPES    = 6    # max swipes to look for "Read privacy policy" (script: 3, blind)
+POLICY_SWIPES = 15   # --ocr only: max swipes down the policy page
+TIMEOUTS = {         # per-step upper bounds, seconds
+    "store":     20,   # Play Store page with Install/Uninstall
+    "install":   300,  # download + install (script: fixed 15 s)
+    "screen":    15,   # any HC screen transition
+    "swipe":     3,    # list to settle after one swipe
+    "policy":    30,   # policy page to load and settle (script: fixed 8 s)
+    "crash":     2,    # "Close app" dialog after backing out
+    "uninstall": 60,
+}
+
+HC_PACKAGE   = "com.google.android.apps.healthdata"
+HC_CONTROLLER = "com.google.android.healthconnect.controller"
+
+# Fixed Start-Sleep seconds UI_testing.sh spends per outcome
+# (postLaunchWait=1, downloadWait=15, screenshotWait=8, Stop-HealthConnect=4,
+#  Uninstall-App=1).
+SCRIPT_SLEEPS = {
+    "no_install":     14,
+    "install_timeout": 14,
+    "no_access":      33,
+    "no_policy_link": 38,
+    "policy":         42,
+    "crashed":        42,
+}
+# outcomes that say more about the Play Store / network than the app: a record
+# with one of these counts as stale, so the next run tries the app again
+RETRY_OUTCOMES = ("install_timeout", "no_install")
+
+# any of these means the Play Store page has finished loading
+STORE_STATES = ("Install", "Uninstall", "Cancel", "not found")
+
+BOUNDS_RE = re.compile(r"\[(\d+),(\d+)\]\[(\d+),(\d+)\]")
+
+class Screen:
+    """Parsed uiautomator dump: (text, class, bounds) of every node, in document order."""
+
+    def __init__(self, xml_text):
+        # exec-out output carries uiautomator's status line after the xml
+        end = xml_text.rfind("</hierarchy>")
+        if end != -1:
+            xml_text = xml_text[xml_text.find("<"):end + len("</hierarchy>")]
+        self.xml = xml_text
+        self.nodes = []
+        try:
+            root = ET.fromstring(xml_text)
+        except ET.ParseError:
+            return
+        for node in root.iter("node"):
+            m = BOUNDS_RE.match(node.get("bounds", ""))
+            if m:
+                self.nodes.append((node.get("text", ""), node.get("class", ""),
+                                   tuple(map(int, m.groups()))))
+
+    def find_all(self, text):
+        """Centres of nodes whose text contains `text` (XPath contains())."""
+        return [((x1 + x2) // 2, (y1 + y2) // 2)
+                for t, _, (x1, y1, x2, y2) in self.nodes if text in t]
+
+    def find(self, text):
+        hits = self.find_all(text)
+        return hits[0] if hits else None
+
+    @property
+    def busy(self):
+        """Still loading: empty dump or a progress spinner on screen."""
+        return not self.nodes or any("ProgressBar" in c for _, c, _ in self.nodes)
+
+class DeviceLost(RuntimeError):
+    """The device went offline / disappeared or stopped answering."""
+
+# adb stderr that means the device itself is gone, not that the command failed
+DEVICE_ERRORS = re.compile(r"device (offline|unauthorized|still connecting)"
+                           r"|device '[^']*' not found|no devices|error: closed")
+
+class Adb:
+    """Thin adb wrapper bound to one device; counts device round-trips."""
+
+    def __init__(self, exe=ADB, serial=None):
+        self.cmd = shlex.split(exe) + (["-s", serial] if serial else [])
+        self.serial = serial
+        self.calls = 0
+
+    def run(self, *args, timeout=120, text=True):
+        self.calls += 1
+        try:
+            res = subprocess.run(self.cmd + list(args), capture_output=True,
+                                 text=text, timeout=timeout)
+        except subprocess.TimeoutExpired as e:
+            raise DeviceLost(f"{self.serial or 'device'}: adb {args[0]} timed out") from e
+        err = res.stderr if text else res.stderr.decode(errors="replace")
+        if res.returncode != 0 and DEVICE_ERRORS.search(err):
+            raise DeviceLost(f"{self.serial or 'device'}: {err.strip()}")
+        return res
+
+    def shell(self, *args, timeout=120):
+        return self.run("shell", *args, timeout=timeout)
+
+    def exec_out(self, *args, timeout=120):
+        """Run on the device and return its raw stdout bytes (binary-safe, no pty)."""
+        return self.run("exec-out", *args, timeout=timeout, text=False).stdout
+
+    def alive(self):
+        try:
+            return self.run("get-state", timeout=10).stdout.strip() == "device"
+        except DeviceLost:
+            return False
+
+class Driver:
+    """One device's flow. `sink(pkg, kind, pngs)` receives the "pp" (policy page)
+    and "permission" (app's HC permission list) screenshots in-process, one per
+    scroll position; `archive` also writes screenshots to `screenshot_dir` (the
+    resume check needs them).
+    """
+
+    def __init__(self, adb, dump_dir, screenshot_dir, log=print, capture=CAPTURE,
+                 archive=True, sink=None):
+        if capture not in ("stream", "pull"):
+            raise ValueError(f"unknown capture mode {capture!r}")
+        self.adb = adb
+        self.dump_dir = Path(dump_dir)
+        self.screenshot_dir = Path(screenshot_dir)
+        self.log = log
+        self.capture_mode = capture
+        self.archive = archive
+        self.sink = sink
+        self.io = Counter()  # host_bytes (written + read), device_files
+
+    # ── device primitives ──────────────────────────────────────────────
+    def dump(self, name):
+        if self.capture_mode == "stream":
+            return Screen(self.adb.exec_out("uiautomator", "dump", "/dev/tty")
+                          .decode("utf-8", errors="replace"))
+        self.adb.shell("uiautomator", "dump", f"/sdcard/{name}.xml")
+        self.io["device_files"] += 1
+        local = self.dump_dir / f"{name}.xml"
+        local.unlink(missing_ok=True)  # never parse a stale dump
+        self.adb.run("pull", f"/sdcard/{name}.xml", str(local))
+        try:
+            xml = local.read_bytes()
+        except OSError:
+            return Screen("")
+        self.io["host_bytes"] += 2 * len(xml)  # pulled to disk, read back
+        return Screen(xml.decode("utf-8", errors="replace"))
+
+    def tap(self, xy):
+        self.adb.shell("input", "tap", str(xy[0]), str(xy[1]))
+
+    def screenshot(self, pkg, kind=None, page=1):
+        """Capture the screen → PNG bytes (empty when pulled and not needed).
+
+        Archived as screen_<pkg>.png, or perm_<pkg>.png for kind "permission";
+        later scroll positions get a _<page> suffix.
+        """
+        suffix = f"_{page}" if page > 1 else ""
+        name = f"{'perm' if kind == 'permission' else 'screen'}_{pkg}{suffix}.png"
+        local = self.screenshot_dir / name
+        if self.capture_mode == "stream":
+            png = self.adb.exec_out("screencap", "-p")
+            if self.archive:
+                local.write_bytes(png)
+                self.io["host_bytes"] += len(png)
+        else:
+            self.adb.shell("screencap", "-p", f"/sdcard/{name}")
+            self.io["device_files"] += 1
+            self.adb.run("pull", f"/sdcard/{name}", str(local))
+            png = b""
+            if local.exists():
+                self.io["host_bytes"] += local.stat().st_size
+                if self.sink and kind:  # the OCR stage re-reads it from disk
+                    png = local.read_bytes()
+                    self.io["host_bytes"] += len(png)
+        return png
+
+    def scroll(self, pkg, kind, name, screen, max_swipes, stop=None):
+        """Swipe down until `stop` is on screen or the page stops moving.
+
+        With a sink, every scroll position is screenshotted as `kind`.
+        Returns (PNG list, last Screen).
+        """
+        shots = [self.screenshot(pkg, kind)] if self.sink else []
+        for _ in range(max_swipes):
+            if stop and screen.find(stop):
+                break
+            self.adb.shell("input", "swipe", "500", "1800", "500", "600", "500")
+            before, screen = screen, self.wait_settled(name, TIMEOUTS["swipe"])
+            if screen.xml == before.xml:
+                break
+            if self.sink:
+                shots.append(self.screenshot(pkg, kind, page=len(shots) + 1))
+        return shots, screen
+
+    def installed(self, pkg):
+        return self.adb.shell("pm", "path", pkg).stdout.startswith("package:")
+
+    def open_store(self, pkg):
+        self.adb.shell("am", "start", "-a", "android.intent.action.VIEW",
+                       "-d", f"market://details?id={pkg}")
+
+    def open_hc(self):
+        self.adb.shell("am", "start", "-a", "android.settings.APPLICATION_DETAILS_SETTINGS",
+                       "-d", f"package:{HC_PACKAGE}")
+
+    # ── waiting ────────────────────────────────────────────────────────
+    def wait_for(self, name, *texts, timeout):
+        """Poll dumps until any of `texts` is on screen; the Screen or None."""
+        deadline = time.monotonic() + timeout
+        while True:
+            screen = self.dump(name)
+            if any(screen.find(t) for t in texts):
+                return screen
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(POLL_INTERVAL)
+
+    def wait_until(self, predicate, timeout):
+        deadline = time.monotonic() + timeout
+        while not predicate():
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(POLL_INTERVAL)
+        return True
+
+    def wait_settled(self, name, timeout, gone=None):
+        """Wait until the screen has loaded and two dumps in a row match.
+
+        With `gone`, that text must have left the screen first. Returns the
+        settled Screen, or the last dump on timeout.
+        """
+        deadline = time.monotonic() + timeout
+        last = None
+        while True:
+            screen = self.dump(name)
+            ready = not screen.busy and not (gone and screen.find(gone))
+            if ready and last is not None and screen.xml == last.xml:
+                return screen
+            if time.monotonic() >= deadline:
+                return screen
+            last = screen if ready else None
+            time.sleep(POLL_INTERVAL)
+
+    # ── flow ───────────────────────────────────────────────────────────
+    def process(self, pkg):
+        """Run the full flow for one package → (outcome, wall seconds).
+
+        Per-app adb round-trips and disk I/O are left in `last_io`.
+        """
+        start = time.monotonic()
+        calls, io = self.adb.calls, self.io.copy()
+        outcome = self.capture(pkg)
+        if outcome not in ("policy", "crashed"):
+            self.log(f"{outcome} → screenshot & skip")
+            self.screenshot(pkg)
+        self.stop_health_connect()
+        self.uninstall(pkg)
+        self.last_io = {"adb_calls": self.adb.calls - calls,
+                        "host_bytes": self.io["host_bytes"] - io["host_bytes"],
+                        "device_files": self.io["device_files"] - io["device_files"]}
+        return outcome, time.monotonic() - start
+
+    def capture(self, pkg):
+        # Step 1: install
+        self.open_store(pkg)
+        screen = self.wait_for("install_dump", *STORE_STATES, timeout=TIMEOUTS["store"])
+        node = screen.find("Install") if screen else None
+        if node is None and self.installed(pkg):
+            # left over from an attempt cut short on this device: the store
+            # page shows Open / Uninstall, which find("Install") doesn't match
+            self.log("already installed, skipping the install step")
+        elif node is None:
+            return "no_install"
+        else:
+            self.tap(node)
+            if not self.wait_until(lambda: self.installed(pkg), TIMEOUTS["install"]):
+                return "install_timeout"
+
+        # Step 2: open HC
+        self.open_hc()
+        screen = self.wait_for("hc_dump", "Open", timeout=TIMEOUTS["screen"])
+        self.tap(screen.find("Open") if screen else (950, 180))
+
+        # Steps 3–4: App permissions
+        screen = self.wait_for("ap_dump", "App permissions", timeout=TIMEOUTS["screen"])
+        if screen:
+            self.tap(screen.find("App permissions"))
+
+        # Step 5: "Not allowed access" / "No apps denied"
+        screen = self.wait_for("ca_dump", "Not allowed access", "No apps denied",
+                               timeout=TIMEOUTS["screen"])
+        na = screen.find("Not allowed access") if screen else None
+        if na is None or screen.find("No apps denied"):
+            return "no_access"
+        self.tap((na[0], na[1] + 100))
+
+        # Steps 6–7: scroll until "Read privacy policy" shows up, or the
+        # list stops moving (bottom reached)
+        # (with a sink, the permission list is screenshotted on the way down)
+        screen = self.wait_settled("rpp_dump", TIMEOUTS["screen"], gone="Not allowed access")
+        shots, screen = self.scroll(pkg, "permission", "rpp_dump", screen, MAX_SWIPES,
+                                    stop="Read privacy policy")
+        if self.sink:
+            self.sink(pkg, "permission", shots)
+        node = screen.find("Read privacy policy")
+        if node is None:
+            return "no_policy_link"
+        self.tap(node)
+
+        # Step 8: screenshot once the policy page has loaded
+        screen = self.wait_settled("pp_dump", TIMEOUTS["policy"], gone="Read privacy policy")
+        if screen.busy or screen.find("Read privacy policy"):
+            self.log("policy page did not settle, capturing anyway")
+        if self.sink:  # the OCR stage gets the whole page, one shot per scroll
+            shots, _ = self.scroll(pkg, "pp", "pp_dump", screen, POLICY_SWIPES)
+            self.sink(pkg, "pp", shots)
+        else:
+            self.screenshot(pkg, "pp")
+
+        for _ in range(3):
+            self.adb.shell("input", "keyevent", "4")
+        screen = self.wait_for("crash_dump", "Close app", timeout=TIMEOUTS["crash"])
+        if screen:
+            self.tap(screen.find("Close app"))
+            return "crashed"
+        return "policy"
+
+    def stop_health_connect(self):
+        self.open_hc()
+        self.adb.shell("am", "force-stop", HC_CONTROLLER)
+
+    def uninstall(self, pkg):
+        if not self.installed(pkg):
+            return
+        self.open_store(pkg)
+        screen = self.wait_for("uninstall_dump", "Uninstall", timeout=TIMEOUTS["store"])
+        if screen:
+            self.tap(screen.find("Uninstall"))
+            # confirm dialog: its "Uninstall" button is the last one on screen
+            dialog = self.wait_for("confirm_dump", "Cancel", timeout=TIMEOUTS["screen"])
+            self.tap(dialog.find_all("Uninstall")[-1] if dialog and dialog.find("Uninstall")
+                     else (840, 1350))
+        if not self.wait_until(lambda: not self.installed(pkg), TIMEOUTS["uninstall"]):
+            self.log("Play Store uninstall did not finish, falling back to adb uninstall")
+            self.adb.run("uninstall", pkg)
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def capture_inputs(package_dir, pkg):
+    return {"apk": file_sha256(Path(package_dir) / f"{pkg}.apk"),
+            "capture_format": CAPTURE_FORMAT}
+
+def write_capture_record(package_dir, screenshot_dir, pkg, outcome, archived):
+    shot = Path(screenshot_dir) / f"screen_{pkg}.png"
+    record = {"package": pkg, "inputs": capture_inputs(package_dir, pkg),
+              "outcome": outcome, "archived": archived,
+              "screenshot": file_sha256(shot) if archived and shot.exists() else None}
+    (Path(screenshot_dir) / f"screen_{pkg}.json").write_text(json.dumps(record, indent=1))
+
+def capture_plan(package_dir, screenshot_dir):
+    """(pkg, reason) per APK; reason is None when its capture is up to date."""
+    for apk in sorted(Path(package_dir).glob("*.apk")):
+        pkg = apk.stem
+        shot = Path(screenshot_dir) / f"screen_{pkg}.png"
+        rec = Path(screenshot_dir) / f"screen_{pkg}.json"
+        if not rec.exists():
+            # screenshots from UI_testing.sh have no record: keep them
+            yield pkg, None if shot.exists() else "not captured"
+            continue
+        old = json.loads(rec.read_text())
+        new = capture_inputs(package_dir, pkg)
+        changed = [k for k in new if old["inputs"].get(k) != new[k]]
+        if changed:
+            yield pkg, f"{', '.join(changed)} changed"
+        elif old["outcome"] in RETRY_OUTCOMES:
+            yield pkg, f"last run: {old['outcome']}"
+        elif old["archived"] and not shot.exists():
+            yield pkg, "screenshot missing"
+        else:
+            yield pkg, None
+
+def pending_packages(package_dir, screenshot_dir):
+    for pkg, reason in capture_plan(package_dir, screenshot_dir):
+        if reason is None:
+            print(f"=== Skipping {pkg} (up to date) ===")
+            continue
+        yield pkg
+
+def print_plan(package_dir, screenshot_dir):
+    todo = 0
+    for pkg, reason in capture_plan(package_dir, screenshot_dir):
+        print(f"  {'capture' if reason else 'keep   '} {pkg}" + (f"  ({reason})" if reason else ""))
+        todo += reason is not None
+    print(f"{todo} apps would be captured")
+
+def write_report(rows, path):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["package", "outcome", "wall_s", "script_sleep_s",
+                    "adb_calls", "host_bytes", "device_files"])
+        w.writerows(rows)
+    if rows:
+        n = len(rows)
+        wall = sum(r[2] for r in rows)
+        script = sum(r[3] for r in rows)
+        print(f"\n{n} apps: driver {wall:.1f}s total ({wall / n:.1f}s/app), "
+              f"UI_testing.sh fixed sleeps alone {script}s ({script / n:.1f}s/app)")
+        print(f"per app: {sum(r[4] for r in rows) / n:.1f} adb round-trips, "
+              f"{sum(r[5] for r in rows) / n / 1024:.1f} KiB host disk I/O, "
+              f"{sum(r[6] for r in rows) / n:.1f} device temp files")
+
+def ocr_sink():
+    """RQ3's in-process OCR ingest (imports easyocr / pymongo on first use)."""
+    rq3 = Path(__file__).resolve().parent.parent / "RQ3_src"
+    sys.path.insert(0, str(rq3))
+    Path("logs").mkdir(exist_ok=True)  # llm_analysis logs to logs/RQ3.log
+    import llm_analysis
+    return llm_analysis.ingest_capture
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Event-driven RQ1 UI driver")
+    ap.add_argument("--packages", default=PACKAGE_DIR, help="folder of <package>.apk files")
+    ap.add_argument("--dumps", default=DUMP_XML_DIR, help="folder for UI dump xml")
+    ap.add_argument("--screenshots", default=SCREENSHOT_DIR, help="folder for screenshots")
+    ap.add_argument("--adb", default=ADB, help="adb command (e.g. 'python fake_adb.py')")
+    ap.add_argument("-s", "--serial", help="device serial")
+    ap.add_argument("--capture", choices=("stream", "pull"), default=CAPTURE,
+                    help="exec-out into memory, or the script's dump/pull via /sdcard")
+    ap.add_argument("--no-archive", action="store_true",
+                    help="keep screenshots in memory only")
+    ap.add_argument("--ocr", action="store_true",
+                    help="hand policy/permission images to RQ3's OCR stage in-process")
+    ap.add_argument("--dry-run", action="store_true", help="list what would be captured and exit")
+    ap.add_argument("--report", default=REPORT_CSV)
+    args = ap.parse_args(argv)
+
+    if args.dry_run:
+        return print_plan(args.packages, args.screenshots)
+    for d in (args.dumps, args.screenshots):
+        Path(d).mkdir(parents=True, exist_ok=True)
+    driver = Driver(Adb(args.adb, args.serial), args.dumps, args.screenshots,
+                    capture=args.capture, archive=not args.no_archive,
+                    sink=ocr_sink() if args.ocr else None)
+    rows = []
+    for pkg in pending_packages(args.packages, args.screenshots):
+        print(f"=== Processing package: {pkg} ===")
+        outcome, wall = driver.process(pkg)
+        write_capture_record(args.packages, args.screenshots, pkg, outcome, driver.archive)
+        io = driver.last_io
+        rows.append((pkg, outcome, round(wall, 2), SCRIPT_SLEEPS[outcome],
+                     io["adb_calls"], io["host_bytes"], io["device_files"]))
+        print(f"=== Done with {pkg}: {outcome} in {wall:.1f}s ===\n")
+    write_report(rows, args.report)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+Versioned model artifacts for the RQ2 ML sweeps.
+
+Each sweep saves the refitted best pipeline per model (optional reducer +
+scaler + classifier) together with the feature config needed to rebuild
+its input from raw `embed_*` vectors:
+
+  models/<embed>/<model>_<pooling>/v<N>.joblib
+
+pooling is "padded" (zero-pad / truncate to max_segs×384) or "mean"
+(average of the 384-d segments). N increments on every save; loading a
+directory picks the newest version.
+"""
+
+import sys
+import time
+import joblib
+import numpy as np
+import sklearn
+from datetime import datetime, timezone
+from pathlib import Path
+
+ARTIFACT_FORMAT = 1
+SEG_DIM = 384
+MODEL_DIR = Path("models")
+
+def pooling_config(desc, X):
+    """Feature config of a sweep's X, derived from the loader's desc string."""
+    if desc.startswith("padded"):
+        return {"pooling": "padded", "max_segs": X.shape[1] // SEG_DIM}
+    return {"pooling": "mean"}
+
+def featurize(vec, pooling):
+    """Raw concatenated embedding → one feature row, as the loaders build it."""
+    vec = np.asarray(vec, dtype=np.float32)
+    if vec.size % SEG_DIM != 0:
+        raise ValueError(f"length {vec.size} not mult of {SEG_DIM}")
+    segs = vec.reshape(-1, SEG_DIM)
+    if pooling["pooling"] == "mean":
+        return segs.mean(axis=0)
+    max_segs = pooling["max_segs"]
+    pad = np.zeros((max_segs, SEG_DIM), dtype=np.float32)
+    segs = segs[:max_segs]
+    pad[:segs.shape[0]] = segs
+    return pad.flatten()
+
+def _versions(folder):
+    return sorted(int(p.stem[1:]) for p in folder.glob("v*.joblib") if p.stem[1:].isdigit())
+
+def save_artifact(search, model, desc, X, embed, metrics, model_dir=MODEL_DIR):
+    """Dump search.best_estimator_ + feature config as the next version."""
+    pooling = pooling_config(desc, X)
+    folder = Path(model_dir) / embed / f"{model}_{pooling['pooling']}"
+    folder.mkdir(parents=True, exist_ok=True)
+    version = (_versions(folder) or [0])[-1] + 1
+    path = folder / f"v{version}.joblib"
+    joblib.dump({
+        "format":     ARTIFACT_FORMAT,
+        "version":    version,
+        "created":    datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "sklearn":    sklearn.__version__,
+        "model":      model,
+        "embed":      embed,
+        "pooling":    pooling,
+        "params":     search.best_params_,
+        "cv_metrics": {k: float(np.mean(v)) for k, v in metrics.items()},
+        "n_train":    int(X.shape[0]),
+        "pipeline":   search.best_estimator_,
+    }, path)
+    print(f" Saved model       : {path}")
+    return path
+
+def load_artifact(path):
+    """Load an artifact file, or the newest version in an artifact folder.
+
+    Returns (artifact dict, load time in seconds).
+    """
+    path = Path(path)
+    if path.is_dir():
+        versions = _versions(path)
+        if not versions:
+            raise FileNotFoundError(f"no v*.joblib artifacts in {path}")
+        path = path / f"v{versions[-1]}.joblib"
+    start = time.perf_counter()
+    art = joblib.load(path)
+    elapsed = time.perf_counter() - start
+    if art.get("format") != ARTIFACT_FORMAT:
+        raise ValueError(f"{path}: unsupported artifact format {art.get('format')}")
+    if art["sklearn"] != sklearn.__version__:
+        print(f"[warn] {path} was saved with scikit-learn {art['sklearn']}, "
+              f"running {sklearn.__version__}", file=sys.stderr)
+    return art, elapsed
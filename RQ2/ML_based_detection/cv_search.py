@@ -0,0 +1,154 @@
+"""
+Shared hyperparameter-search helpers for the RQ2 ML sweeps.
+
+  • make_search   – exhaustive GridSearchCV or budgeted successive halving
+                    (FullBudgetHalvingSearchCV)
+  • fold_metrics  – per-fold Acc/Prec/Rec/F1 of the best candidate, read
+                    straight from the search's cv_results_ (no second fit)
+  • compare_with_grid – time saved / best-score delta vs. the exhaustive grid
+  • store_results / refit_best / benchmark_against – shared plumbing for
+                    the hand-rolled searches (precomputed kernels, LR path)
+"""
+
+import time
+import numpy as np
+from sklearn.base import clone
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import GridSearchCV, HalvingGridSearchCV
+from sklearn.metrics import accuracy_score, precision_recall_fscore_support
+
+HALVING_FACTOR = 3
+
+def macro_scores(estimator, X, y):
+    """Multi-metric scorer; macro-F1 is keyed as "score" so it drives ranking."""
+    pred = estimator.predict(X)
+    pr, rc, f1, _ = precision_recall_fscore_support(
+        y, pred, average="macro", zero_division=0
+    )
+    return {"acc": accuracy_score(y, pred), "prec": pr, "rec": rc, "score": f1}
+
+class FullBudgetHalvingSearchCV(HalvingGridSearchCV):
+    """HalvingGridSearchCV whose last rung always runs on max_resources.
+
+    The halving ladder is min_resources·factor^k, which rarely lands on
+    max_resources (500 trees → 486, 120 samples → 117 with the test folds
+    subsampled too). When the last rung comes up short, its candidates are
+    scored once more on the full budget: all samples with the unsubsampled
+    folds, or resource = max_resources. That extra rung is the last `iter`
+    in cv_results_, so best_params_, best_score_ and the per-fold scores are
+    full-budget results.
+    """
+
+    def _run_search(self, evaluate_candidates):
+        last = {}
+
+        def evaluate(candidate_params, cv=None, more_results=None):
+            last["params"] = list(candidate_params)
+            return evaluate_candidates(candidate_params, cv, more_results=more_results)
+
+        super()._run_search(evaluate)
+        if self.n_resources_[-1] >= self.max_resources_:
+            return
+        params = last["params"]
+        if self.resource != "n_samples":
+            params = [{**c, self.resource: self.max_resources_} for c in params]
+        n = len(params)
+        evaluate_candidates(params, self._checked_cv_orig, more_results={
+            "iter": [self.n_iterations_] * n,
+            "n_resources": [self.max_resources_] * n,
+        })
+        self.n_resources_.append(self.max_resources_)
+        self.n_candidates_.append(n)
+        self.n_iterations_ += 1
+
+def make_search(estimator, param_grid, cv, mode="grid",
+                resource="n_samples", max_resources="auto", verbose=0):
+    """Build the search object for `mode` ("grid" or "halving").
+
+    In halving mode the budget is `resource`: either "n_samples" or an
+    estimator parameter such as "n_estimators" (which must then be left out
+    of `param_grid`). Each rung keeps the top 1/HALVING_FACTOR candidates and
+    the last rung always runs on the full budget (see
+    FullBudgetHalvingSearchCV), so the reported metrics are full-data CV.
+    """
+    if mode == "grid":
+        return GridSearchCV(
+            estimator, param_grid=param_grid, scoring=macro_scores,
+            refit="score", cv=cv, n_jobs=-1, verbose=verbose
+        )
+    if mode == "halving":
+        return FullBudgetHalvingSearchCV(
+            estimator, param_grid=param_grid, scoring=macro_scores,
+            refit="score", cv=cv, n_jobs=-1, verbose=verbose,
+            factor=HALVING_FACTOR, resource=resource,
+            max_resources=max_resources, min_resources="exhaust",
+            return_train_score=False
+        )
+    raise ValueError(f"unknown search mode {mode!r}")
+
+def timed_fit(search, X, y):
+    start = time.perf_counter()
+    search.fit(X, y)
+    return search, time.perf_counter() - start
+
+def fold_metrics(search):
+    """Per-fold metrics of search.best_index_ → {"acc": [...], ..., "f1": [...]}."""
+    res, i = search.cv_results_, search.best_index_
+    n_splits = search.n_splits_
+    out = {}
+    for key, name in [("acc", "acc"), ("prec", "prec"), ("rec", "rec"), ("f1", "score")]:
+        out[key] = np.array([res[f"split{k}_test_{name}"][i] for k in range(n_splits)])
+    return out
+
+def n_fits(search):
+    """Number of (candidate, fold) fits the search actually ran."""
+    return len(search.cv_results_["params"]) * search.n_splits_
+
+def compare_with_grid(search, t_search, make_grid, X, y):
+    """Run the exhaustive grid via `make_grid()` and report what halving saved."""
+    grid, t_grid = timed_fit(make_grid(), X, y)
+    print(f" Exhaustive grid   : {t_grid:.1f}s, {n_fits(grid)} fits, "
+          f"best macro-F1 {grid.best_score_:.3f} {grid.best_params_}")
+    print(f" Halving search    : {t_search:.1f}s, {n_fits(search)} fits, "
+          f"best macro-F1 {search.best_score_:.3f}")
+    print(f" Time saved        : {t_grid - t_search:.1f}s "
+          f"({t_grid / max(t_search, 1e-9):.1f}× faster)")
+    print(f" Best-F1 difference: {search.best_score_ - grid.best_score_:+.3f}")
+    return grid, t_grid
+
+def store_results(search, candidates, scores):
+    """Fill GridSearchCV-style attributes from scores[candidate][fold] dicts.
+
+    Ties resolve to the first candidate in ParameterGrid order, as in
+    GridSearchCV, so hand-rolled searches select the same best params.
+    """
+    n_splits = len(scores[0])
+    res = {"params": candidates}
+    for name in ("acc", "prec", "rec", "score"):
+        for k in range(n_splits):
+            res[f"split{k}_test_{name}"] = np.array([s[k][name] for s in scores])
+        res[f"mean_test_{name}"] = np.mean(
+            [res[f"split{k}_test_{name}"] for k in range(n_splits)], axis=0
+        )
+    search.cv_results_ = res
+    search.n_splits_ = n_splits
+    search.best_index_ = int(np.argmax(res["mean_test_score"]))
+    search.best_params_ = candidates[search.best_index_]
+    search.best_score_ = res["mean_test_score"][search.best_index_]
+    return search
+
+def refit_best(search, X, y):
+    """Refit search.pipe with the best params on all data (GridSearchCV refit)."""
+    search.best_estimator_ = clone(search.pipe).set_params(**search.best_params_).fit(X, y)
+    return search
+
+def benchmark_against(search, t_search, make_ref, X, y, label, ref_label="Exhaustive grid"):
+    """Fit the reference search from `make_ref()`; report speedup and agreement."""
+    ref, t_ref = timed_fit(make_ref(), X, y)
+    diff = np.abs(ref.cv_results_["mean_test_score"] - search.cv_results_["mean_test_score"])
+    print(f" {ref_label:<18}: {t_ref:.1f}s, best {ref.best_params_}")
+    print(f" {label:<18}: {t_search:.1f}s, best {search.best_params_}")
+    print(f" Speedup           : {t_ref / max(t_search, 1e-9):.1f}×")
+    print(f" Same best params  : {ref.best_params_ == search.best_params_}, "
+          f"max |ΔF1| over grid {diff.max():.2e}")
+    return ref, t_ref
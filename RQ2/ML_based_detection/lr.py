@@ -5,22 +5,25 @@ One-shot LogisticRegression hyperparameter sweep on two embedding variants:
 
 For each mode:
   1. Load & process into X (n_samples×D) and y
-  2. GridSearchCV over LogisticRegression params
-  3. Report best params + 5-fold Acc/Prec/Rec/F1
+  2. GridSearchCV over LogisticRegression params, or a warm-started C path
+     per fold on PATH_SOLVERS when SEARCH_MODE = "path" (see lr_path.py)
+  3. Report best params + 5-fold Acc/Prec/Rec/F1 from the search's own folds
+
+REDUCTION puts a cached per-fold reducer in front of the scaler on the
+padded variant (see reduction.py).
 """
 
 import json
 import numpy as np
 from pathlib import Path
-from sklearn.model_selection import StratifiedKFold, GridSearchCV
+from sklearn.model_selection import StratifiedKFold
 from sklearn.pipeline import make_pipeline
 from sklearn.preprocessing import StandardScaler
 from sklearn.linear_model import LogisticRegression
-from sklearn.metrics import (
-    accuracy_score,
-    precision_recall_fscore_support,
-    make_scorer
-)
+from cv_search import make_search, timed_fit, fold_metrics, benchmark_against
+from lr_path import WarmStartPathSearch, compare_with_original
+from reduction import reduction_step, dimension_report
+from artifacts import save_artifact
 
 embed = "embed_RA_java"
 
@@ -33,6 +36,16 @@ LR_PARAMS = {
     "logisticregression__C":      [0.01, 0.1, 1, 10, 100],
     "logisticregression__solver": ["liblinear", "saga"]
 }
+
+SEARCH_MODE    = "grid"   # "grid" (independent fits) or "path" (warm-started C path)
+PATH_SOLVERS   = ["lbfgs"]  # path only: replaces the solver list (see lr_path.WARM_START_SOLVERS)
+BENCHMARK_PATH = False    # path only: also run the same-solver and LR_PARAMS grids, report speedup / best C
+
+REDUCTION             = None  # None, "pca", "svd" or "srp": per-fold reduction cached on disk
+REDUCTION_DIM         = 256
+REDUCTION_REPORT_DIMS = []    # e.g. [64, 128, 256, 512]: fit time + best macro-F1 per dim
+
+SAVE_MODELS = True            # dump the refitted best pipeline to models/ (see artifacts.py)
 # ────────────────────────────────────────────────────────────────────────────
 
 def load_avg(path):
@@ -64,47 +77,55 @@ def load_padded(path):
 
 def sweep_lr(X, y, desc):
     print("\n" + "="*60)
-    print(f"MODE: LogisticRegression on {desc}")
+    print(f"MODE: LogisticRegression on {desc} [{SEARCH_MODE} search]")
     print("="*60)
-    scorer = make_scorer(
-        lambda yt, yp: precision_recall_fscore_support(
-            yt, yp, average="macro", zero_division=0
-        )[2]
-    )
     cv = StratifiedKFold(n_splits=N_SPLITS, shuffle=True, random_state=RANDOM_SEED)
 
-    pipe = make_pipeline(
-        StandardScaler(with_mean=(desc.startswith("averaged"))),
-        LogisticRegression(class_weight="balanced", max_iter=1000, random_state=RANDOM_SEED)
-    )
-    grid = GridSearchCV(
-        pipe,
-        param_grid=LR_PARAMS,
-        scoring=scorer,
-        cv=cv,
-        n_jobs=-1,
-        verbose=1
-    )
-    grid.fit(X, y)
-
-    best = grid.best_estimator_
-    print("\n>>> Best params:", grid.best_params_)
-    print(f">>> Best grid-CV macro-F1: {grid.best_score_:.3f}")
-
-    accs, precs, recs, f1s = [], [], [], []
-    for train, test in cv.split(X, y):
-        best.fit(X[train], y[train])
-        pred = best.predict(X[test])
-        accs.append(accuracy_score(y[test], pred))
-        pr, rc, f1, _ = precision_recall_fscore_support(
-            y[test], pred, average="macro", zero_division=0
+    reducer = reduction_step(REDUCTION, REDUCTION_DIM, X, desc, RANDOM_SEED)
+
+    def make_pipe(reducer):
+        steps = [reducer] if reducer is not None else []
+        return make_pipeline(
+            *steps,
+            StandardScaler(with_mean=(desc.startswith("averaged"))),
+            LogisticRegression(class_weight="balanced", max_iter=1000, random_state=RANDOM_SEED)
         )
-        precs.append(pr); recs.append(rc); f1s.append(f1)
 
-    print(f"5-Fold Acc : {np.mean(accs):.3f}")
-    print(f"5-Fold Prec: {np.mean(precs):.3f}")
-    print(f"5-Fold Rec : {np.mean(recs):.3f}")
-    print(f"5-Fold F1  : {np.mean(f1s):.3f}")
+    params = LR_PARAMS
+    if SEARCH_MODE == "path":
+        params = {**LR_PARAMS, "logisticregression__solver": PATH_SOLVERS}
+
+    def build(reducer):
+        if SEARCH_MODE == "path":
+            return WarmStartPathSearch(make_pipe(reducer), params, cv)
+        return make_search(make_pipe(reducer), params, cv, mode="grid", verbose=1)
+
+    def make_grid():
+        return make_search(make_pipe(reducer), params, cv, mode="grid", verbose=1)
+
+    def make_original():
+        return make_search(make_pipe(reducer), LR_PARAMS, cv, mode="grid", verbose=1)
+
+    search = build(reducer)
+    search, t_search = timed_fit(search, X, y)
+
+    print("\n>>> Best params:", search.best_params_)
+    print(f">>> Best grid-CV macro-F1: {search.best_score_:.3f}")
+    if SEARCH_MODE == "path" and BENCHMARK_PATH:
+        print(f" Solver iterations : {search.n_iter_} along the path")
+        benchmark_against(search, t_search, make_grid, X, y, "Warm-start path",
+                          ref_label="Grid, same solver")
+        compare_with_original(search, t_search, make_original, X, y, "logisticregression__C")
+
+    m = fold_metrics(search)
+    print(f"5-Fold Acc : {np.mean(m['acc']):.3f}")
+    print(f"5-Fold Prec: {np.mean(m['prec']):.3f}")
+    print(f"5-Fold Rec : {np.mean(m['rec']):.3f}")
+    print(f"5-Fold F1  : {np.mean(m['f1']):.3f}")
+    if SAVE_MODELS:
+        save_artifact(search, "LogisticRegression", desc, X, embed, m)
+    if REDUCTION and REDUCTION_REPORT_DIMS:
+        dimension_report(build, X, y, cv, REDUCTION, REDUCTION_REPORT_DIMS, desc, RANDOM_SEED)
 
 if __name__ == "__main__":
     # Averaged embeddings
@@ -0,0 +1,98 @@
+"""
+Batch scoring of new app embeddings with a saved RQ2 model artifact.
+
+  python predict.py models/embed_RA_java/RandomForest_padded new_apps.jsonl
+  python predict.py models/.../v3.joblib batch_1.jsonl batch_2.pkl -o preds.csv
+
+Inputs are streamed record by record and scored in micro-batches, so memory
+stays at one batch of feature rows regardless of input size:
+  • *.jsonl – one {"package": ..., "<embed>": [...]} object per line
+  • *.pkl   – the same records pickled back-to-back (or one pickled list)
+
+Writes package,prediction,score CSV (score = positive-class probability or
+decision value when the model has one) to stdout or -o, and reports artifact
+load time and predictions/s on stderr.
+"""
+
+import argparse
+import csv
+import json
+import pickle
+import sys
+import time
+from itertools import islice
+from pathlib import Path
+import numpy as np
+from artifacts import load_artifact, featurize
+
+BATCH_SIZE = 256
+
+def iter_records(path):
+    path = Path(path)
+    if path.suffix in (".pkl", ".pickle"):
+        with path.open("rb") as f:
+            while True:
+                try:
+                    obj = pickle.load(f)
+                except EOFError:
+                    return
+                if isinstance(obj, list):
+                    yield from obj
+                else:
+                    yield obj
+    else:
+        with path.open(encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+def iter_batches(paths, embed, pooling, batch_size):
+    records = (r for p in paths for r in iter_records(p))
+    while True:
+        chunk = list(islice(records, batch_size))
+        if not chunk:
+            return
+        X = np.stack([featurize(r[embed], pooling) for r in chunk])
+        yield [r["package"] for r in chunk], X
+
+def scores_of(pipeline, X):
+    if hasattr(pipeline, "predict_proba"):
+        return pipeline.predict_proba(X)[:, -1]
+    if hasattr(pipeline, "decision_function"):
+        return pipeline.decision_function(X)
+    return [""] * len(X)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    ap.add_argument("artifact", help="artifact .joblib file or its model folder (newest version)")
+    ap.add_argument("inputs", nargs="+", help="embed_* .jsonl / .pkl files")
+    ap.add_argument("-o", "--out", help="output CSV (default: stdout)")
+    ap.add_argument("-b", "--batch-size", type=int, default=BATCH_SIZE)
+    args = ap.parse_args(argv)
+
+    art, t_load = load_artifact(args.artifact)
+    pipeline = art["pipeline"]
+    print(f"Loaded {art['model']} v{art['version']} ({art['embed']}, {art['pooling']}) "
+          f"in {t_load:.3f}s", file=sys.stderr)
+
+    out = open(args.out, "w", newline="", encoding="utf-8") if args.out else sys.stdout
+    writer = csv.writer(out)
+    writer.writerow(["package", "prediction", "score"])
+    n, t_model = 0, 0.0
+    start = time.perf_counter()
+    for packages, X in iter_batches(args.inputs, art["embed"], art["pooling"], args.batch_size):
+        t0 = time.perf_counter()
+        pred = pipeline.predict(X)
+        score = scores_of(pipeline, X)
+        t_model += time.perf_counter() - t0
+        writer.writerows(zip(packages, pred, score))
+        n += len(packages)
+    total = time.perf_counter() - start
+    if out is not sys.stdout:
+        out.close()
+
+    print(f"Scored {n} apps in {total:.2f}s: {n / max(total, 1e-9):.0f} predictions/s "
+          f"end-to-end, {n / max(t_model, 1e-9):.0f}/s in the model", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
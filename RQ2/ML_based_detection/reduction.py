@@ -0,0 +1,93 @@
+"""
+Optional dimensionality-reduction stage for the padded embeddings.
+
+FoldReducer is the first pipeline step of every RQ2 sweep on the padded
+variant when REDUCTION is set; the 384-d averaged features are left as is.
+Its fit is memoized on disk with joblib.Memory, keyed by (method,
+n_components, seed) and a hash of the fold's training matrix, so it runs
+once per CV fold and every later model / grid point / script that sees the
+same fold loads the fitted reducer instead of refitting it.
+
+  • "pca"  – PCA (dense, centred)
+  • "svd"  – TruncatedSVD (no centring; suits the mostly-zero padding)
+  • "srp"  – SparseRandomProjection (data-independent, near-free to fit)
+"""
+
+import time
+import numpy as np
+from pathlib import Path
+from joblib import Memory
+from sklearn.base import BaseEstimator, TransformerMixin, clone
+from sklearn.decomposition import PCA, TruncatedSVD
+from sklearn.random_projection import SparseRandomProjection
+
+CACHE_DIR = Path("cache/reduction")
+
+def _make_reducer(method, n_components, seed):
+    if method == "pca":
+        return PCA(n_components=n_components, random_state=seed)
+    if method == "svd":
+        return TruncatedSVD(n_components=n_components, random_state=seed)
+    if method == "srp":
+        return SparseRandomProjection(
+            n_components=n_components, dense_output=True, random_state=seed
+        )
+    raise ValueError(f"unknown reduction method {method!r}")
+
+def _fit_reducer(method, n_components, seed, X):
+    start = time.perf_counter()
+    reducer = _make_reducer(method, n_components, seed).fit(X)
+    return reducer, time.perf_counter() - start
+
+class FoldReducer(BaseEstimator, TransformerMixin):
+    """Disk-cached PCA / TruncatedSVD / SparseRandomProjection.
+
+    n_components is clipped to what the fold allows (PCA: ≤ min(n, D),
+    SVD: < D). fit_time_ is the original (uncached) fit time.
+    """
+
+    def __init__(self, method="svd", n_components=256, random_state=42,
+                 cache_dir=CACHE_DIR):
+        self.method = method
+        self.n_components = n_components
+        self.random_state = random_state
+        self.cache_dir = cache_dir
+
+    def fit(self, X, y=None):
+        n, d = X.shape
+        k = min(self.n_components, d - 1 if self.method == "svd" else d)
+        if self.method == "pca":
+            k = min(k, n)
+        fit = Memory(self.cache_dir, verbose=0).cache(_fit_reducer)
+        self.reducer_, self.fit_time_ = fit(self.method, k, self.random_state, X)
+        return self
+
+    def transform(self, X):
+        return self.reducer_.transform(X).astype(np.float32)
+
+def reduction_step(method, n_components, X, desc, seed=42):
+    """FoldReducer for `method`, or None when off, X is not the padded
+    variant (per the loader's desc) or X is already small."""
+    if method is None or not desc.startswith("padded") or X.shape[1] <= n_components:
+        return None
+    return FoldReducer(method, n_components, random_state=seed)
+
+def dimension_report(make_search_for, X, y, cv, method, dims, desc, seed=42):
+    """Best macro-F1 and reducer fit time for each target dimension.
+
+    `make_search_for(reducer)` must build the sweep's search with `reducer`
+    as the first pipeline step. Prints nothing when no dimension applies
+    (averaged variant, or every dim ≥ the feature count).
+    """
+    reducers = [(dim, reduction_step(method, dim, X, desc, seed)) for dim in dims]
+    reducers = [(dim, r) for dim, r in reducers if r is not None]
+    if not reducers:
+        return
+    print(f"\n Reduction report ({method}):")
+    print(f" {'dim':>6} | {'fit s/fold':>10} | {'sweep s':>8} | {'macro-F1':>8}")
+    for dim, reducer in reducers:
+        fit_times = [clone(reducer).fit(X[train]).fit_time_ for train, _ in cv.split(X, y)]
+        start = time.perf_counter()
+        search = make_search_for(reducer).fit(X, y)
+        print(f" {dim:>6} | {np.mean(fit_times):>10.2f} | "
+              f"{time.perf_counter() - start:>8.1f} | {search.best_score_:>8.3f}")
@@ -5,20 +5,24 @@ One‐shot RandomForest hyperparameter sweep on two embedding variants:
 
 For each mode:
   1. Load & process into X (n_samples×D) and y
-  2. GridSearchCV over RF params (macro-F1)
-  3. Report best params + 5-fold Accuracy/Prec/Rec/F1
+  2. GridSearchCV over RF params (macro-F1), or successive halving over
+     n_estimators when SEARCH_MODE = "halving"
+  3. Report best params + 5-fold Accuracy/Prec/Rec/F1 taken from the
+     search's own per-fold results
+
+REDUCTION puts a cached per-fold reducer in front of the forest on the
+padded variant (see reduction.py).
 """
 
 import json
 import numpy as np
 from pathlib import Path
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import StratifiedKFold, GridSearchCV
-from sklearn.metrics import (
-    accuracy_score,
-    precision_recall_fscore_support,
-    make_scorer
-)
+from sklearn.model_selection import StratifiedKFold
+from sklearn.pipeline import make_pipeline
+from cv_search import make_search, timed_fit, fold_metrics, compare_with_grid
+from reduction import reduction_step, dimension_report
+from artifacts import save_artifact
 
 embed = "embed_RA_java"
 
@@ -33,6 +37,15 @@ RF_PARAMS = {
     "min_samples_split": [2, 5, 10],
     "min_samples_leaf":  [1, 2, 4]
 }
+
+SEARCH_MODE       = "grid"   # "grid" (exhaustive) or "halving" (budget = n_estimators)
+COMPARE_WITH_GRID = False    # halving only: also run the full grid and report savings
+
+REDUCTION             = None  # None, "pca", "svd" or "srp": per-fold reduction cached on disk
+REDUCTION_DIM         = 256
+REDUCTION_REPORT_DIMS = []    # e.g. [64, 128, 256, 512]: fit time + best macro-F1 per dim
+
+SAVE_MODELS = True            # dump the refitted best pipeline to models/ (see artifacts.py)
 # ────────────────────────────────────────────────────────────────────────────
 
 def load_avg(path):
@@ -63,43 +76,48 @@ def load_padded(path):
 
 def rf_sweep(X, y, desc):
     print("\n" + "="*60)
-    print(f"MODE: RandomForest on {desc}")
+    print(f"MODE: RandomForest on {desc} [{SEARCH_MODE} search]")
     print("="*60)
-    scorer = make_scorer(
-        lambda yt, yp: precision_recall_fscore_support(
-            yt, yp, average="macro", zero_division=0
-        )[2]
-    )
     cv = StratifiedKFold(n_splits=N_SPLITS, shuffle=True, random_state=RANDOM_SEED)
-    rf = RandomForestClassifier(class_weight="balanced", random_state=RANDOM_SEED)
-    grid = GridSearchCV(
-        rf,
-        param_grid=RF_PARAMS,
-        scoring=scorer,
-        cv=cv,
-        n_jobs=-1,
-        verbose=1
-    )
-    grid.fit(X, y)
-
-    best = grid.best_estimator_
-    print("\n>>> Best RF params:", grid.best_params_)
-    print(f">>> Best grid‐CV macro-F1: {grid.best_score_:.3f}")
-
-    accs, precs, recs, f1s = [], [], [], []
-    for train, test in cv.split(X, y):
-        best.fit(X[train], y[train])
-        pred = best.predict(X[test])
-        accs.append(accuracy_score(y[test], pred))
-        pr, rc, f1, _ = precision_recall_fscore_support(
-            y[test], pred, average="macro", zero_division=0
-        )
-        precs.append(pr); recs.append(rc); f1s.append(f1)
-
-    print(f"5-Fold Acc : {np.mean(accs):.3f}")
-    print(f"5-Fold Prec: {np.mean(precs):.3f}")
-    print(f"5-Fold Rec : {np.mean(recs):.3f}")
-    print(f"5-Fold F1  : {np.mean(f1s):.3f}")
+    reducer = reduction_step(REDUCTION, REDUCTION_DIM, X, desc, RANDOM_SEED)
+
+    def build(reducer, mode=SEARCH_MODE):
+        est = RandomForestClassifier(class_weight="balanced", random_state=RANDOM_SEED)
+        prefix = ""
+        if reducer is not None:
+            est = make_pipeline(reducer, est)
+            prefix = "randomforestclassifier__"
+        if mode == "halving":
+            params = {prefix + k: v for k, v in RF_PARAMS.items() if k != "n_estimators"}
+            return make_search(
+                est, params, cv, mode="halving",
+                resource=prefix + "n_estimators",
+                max_resources=max(RF_PARAMS["n_estimators"]),
+                verbose=1
+            )
+        params = {prefix + k: v for k, v in RF_PARAMS.items()}
+        return make_search(est, params, cv, mode="grid", verbose=1)
+
+    def make_grid():
+        return build(reducer, mode="grid")
+
+    search = build(reducer)
+    search, t_search = timed_fit(search, X, y)
+
+    print("\n>>> Best RF params:", search.best_params_)
+    print(f">>> Best grid‐CV macro-F1: {search.best_score_:.3f}")
+    if SEARCH_MODE == "halving" and COMPARE_WITH_GRID:
+        compare_with_grid(search, t_search, make_grid, X, y)
+
+    m = fold_metrics(search)
+    print(f"5-Fold Acc : {np.mean(m['acc']):.3f}")
+    print(f"5-Fold Prec: {np.mean(m['prec']):.3f}")
+    print(f"5-Fold Rec : {np.mean(m['rec']):.3f}")
+    print(f"5-Fold F1  : {np.mean(m['f1']):.3f}")
+    if SAVE_MODELS:
+        save_artifact(search, "RandomForest", desc, X, embed, m)
+    if REDUCTION and REDUCTION_REPORT_DIMS:
+        dimension_report(build, X, y, cv, REDUCTION, REDUCTION_REPORT_DIMS, desc, RANDOM_SEED)
 
 if __name__ == "__main__":
     X_avg, y_avg, d_avg = load_avg(DATA_PATH)
@@ -6,19 +6,27 @@ One‐shot SVM model sweep over two different vector preparations:
 
 For each mode, we:
   • load & process the embeddings into X (n_samples×D) and y
-  • run GridSearchCV over several SVM variants
-  • report best params + 5‐fold Acc/Prec/Rec/F1
+  • run GridSearchCV over several SVM variants (or successive halving
+    over training samples when SEARCH_MODE = "halving")
+  • report best params + 5‐fold Acc/Prec/Rec/F1 from the search's own folds
+
+With KERNEL_MODE = "precomputed" the SVC/NuSVC grids are evaluated on Gram
+matrices built once per fold (see kernels.py) instead of letting libsvm
+recompute kernels for every grid point; LinearSVC is unaffected.
+REDUCTION puts a cached per-fold reducer in front of every model on the
+padded variant (see reduction.py).
 """
 import json
 import numpy as np
 from pathlib import Path
-from sklearn.model_selection import StratifiedKFold, GridSearchCV
+from sklearn.model_selection import StratifiedKFold
 from sklearn.pipeline import make_pipeline
 from sklearn.preprocessing import StandardScaler
 from sklearn.svm import LinearSVC, SVC, NuSVC
-from sklearn.metrics import (
-    accuracy_score, precision_recall_fscore_support, make_scorer
-)
+from cv_search import make_search, timed_fit, fold_metrics, compare_with_grid
+from kernels import PrecomputedSearch, supports_precomputed, compare_with_native
+from reduction import reduction_step, dimension_report
+from artifacts import save_artifact
 
 embed = "embed_RA_java"
 
@@ -26,6 +34,18 @@ embed = "embed_RA_java"
 DATA_PATH = Path(f"HC-compatible_apps_{embed}.jsonl")
 N_SPLITS   = 5
 RANDOM_SEED = 42
+
+SEARCH_MODE       = "grid"   # "grid" (exhaustive) or "halving" (budget = n_samples)
+COMPARE_WITH_GRID = False    # halving only: also run the full grid and report savings
+
+KERNEL_MODE       = "native" # "native" (libsvm kernels) or "precomputed" (shared Gram matrices, grid only)
+BENCHMARK_KERNELS = False    # precomputed only: also run the native grid and report speedup
+
+REDUCTION             = None  # None, "pca", "svd" or "srp": per-fold reduction cached on disk
+REDUCTION_DIM         = 256
+REDUCTION_REPORT_DIMS = []    # e.g. [64, 128, 256, 512]: fit time + best macro-F1 per dim
+
+SAVE_MODELS = True            # dump the refitted best pipeline to models/ (see artifacts.py)
 # ─────────────────────────────────────────────────────────────────
 
 def load_data_padded(data_path):
@@ -85,50 +105,60 @@ def make_models():
     }
 
 def run_sweep(X, y, desc):
+    if KERNEL_MODE == "precomputed" and SEARCH_MODE != "grid":
+        raise ValueError('KERNEL_MODE = "precomputed" runs an exhaustive grid; '
+                         f'it cannot be combined with SEARCH_MODE = "{SEARCH_MODE}"')
     print("\n" + "="*60)
-    print(f"MODE: {desc}")
+    print(f"MODE: {desc} [{SEARCH_MODE} search]")
     print("="*60)
 
-    scorer = make_scorer(lambda yt, yp: precision_recall_fscore_support(
-        yt, yp, average="macro", zero_division=0
-    )[2])
-
     cv = StratifiedKFold(n_splits=N_SPLITS, shuffle=True, random_state=RANDOM_SEED)
 
+    reducer = reduction_step(REDUCTION, REDUCTION_DIM, X, desc, RANDOM_SEED)
+
     for name, (estimator, grid) in make_models().items():
-        pipe = make_pipeline(
-            StandardScaler(with_mean=(desc!="padded")),  # center only if averaged
-            estimator
-        )
-        gs = GridSearchCV(
-            pipe, param_grid=grid, scoring=scorer,
-            cv=cv, n_jobs=-1, verbose=0
-        )
-        gs.fit(X, y)
-
-        best = gs.best_estimator_
-        bp   = gs.best_params_
-        bf1  = gs.best_score_
-
-        # final 5-fold metrics
-        accs = []; precs = []; recs = []; f1s = []
-        for train, test in cv.split(X, y):
-            best.fit(X[train], y[train])
-            pred = best.predict(X[test])
-            accs.append(accuracy_score(y[test], pred))
-            pr, rc, f1, _ = precision_recall_fscore_support(
-                y[test], pred, average="macro", zero_division=0
+        precomputed = KERNEL_MODE == "precomputed" and supports_precomputed(estimator)
+
+        def make_pipe(reducer):
+            steps = [reducer] if reducer is not None else []
+            return make_pipeline(
+                *steps,
+                StandardScaler(with_mean=(desc!="padded")),  # center only if averaged
+                estimator
             )
-            precs.append(pr); recs.append(rc); f1s.append(f1)
+
+        def build(reducer):
+            if precomputed:
+                return PrecomputedSearch(make_pipe(reducer), grid, cv)
+            return make_search(make_pipe(reducer), grid, cv,
+                               mode=SEARCH_MODE, resource="n_samples")
+
+        def make_grid():
+            return make_search(make_pipe(reducer), grid, cv, mode="grid")
+
+        search = build(reducer)
+        search, t_search = timed_fit(search, X, y)
+
+        bp   = search.best_params_
+        bf1  = search.best_score_
+        m    = fold_metrics(search)
 
         print(f"\n{name}")
         print("-"*len(name))
         print(f" Best params       : {bp}")
         print(f" Grid-CV macro-F1  : {bf1:.3f}")
-        print(f" Test 5-fold Acc   : {np.mean(accs):.3f}")
-        print(f" Test 5-fold Prec  : {np.mean(precs):.3f}")
-        print(f" Test 5-fold Rec   : {np.mean(recs):.3f}")
-        print(f" Test 5-fold F1    : {np.mean(f1s):.3f}")
+        if precomputed and BENCHMARK_KERNELS:
+            compare_with_native(search, t_search, make_grid, X, y)
+        elif SEARCH_MODE == "halving" and COMPARE_WITH_GRID:
+            compare_with_grid(search, t_search, make_grid, X, y)
+        print(f" Test 5-fold Acc   : {np.mean(m['acc']):.3f}")
+        print(f" Test 5-fold Prec  : {np.mean(m['prec']):.3f}")
+        print(f" Test 5-fold Rec   : {np.mean(m['rec']):.3f}")
+        print(f" Test 5-fold F1    : {np.mean(m['f1']):.3f}")
+        if SAVE_MODELS:
+            save_artifact(search, name, desc, X, embed, m)
+        if REDUCTION and REDUCTION_REPORT_DIMS:
+            dimension_report(build, X, y, cv, REDUCTION, REDUCTION_REPORT_DIMS, desc, RANDOM_SEED)
 
 if __name__ == "__main__":
     # Padded
@@ -0,0 +1,182 @@
+import os
+import json
+import math
+import time
+import logging
+from collections import Counter
+import requests
+import ollama
+
+# Small-to-large model cascade for the permission × segment questions of llm_analyze_pp.
+# Each screening tier answers a constrained Yes/No with a confidence, either from
+# self-consistency (majority of `samples` sampled answers) or from the token
+# log-probabilities of Yes vs No. A confident "No" settles the question at that
+# tier; a "Yes" or an uncertain answer moves on to the next tier, and finally to
+# query_llm on the large model, which confirms and extracts the supporting sentences.
+
+cascade_tiers = [
+	{"model": "gemma3:1b", "confidence": "vote", "samples": 5, "threshold": 0.8},
+]
+
+answer_schema = {
+	"type": "object",
+	"properties": {"answer": {"type": "string", "enum": ["Yes", "No"]}},
+	"required": ["answer"],
+}
+
+
+def ollama_url(path):
+	# same server the ollama client talks to (OLLAMA_HOST)
+	host = os.environ.get("OLLAMA_HOST", "127.0.0.1:11434")
+	if "://" not in host:
+		host = "http://" + host
+	return host.rstrip("/") + path
+
+
+def screen_prompt(pp_text, requested_permission):
+	return (
+		"Read the following quoted text from the privacy policy."
+		f"Does the quoted text explicitly contain rationales specific for {requested_permission} — that is, clear explanations of"
+		f"why the app requests {requested_permission} and how the {requested_permission} will be used or handled?\n\n"
+		f"The quoted sentences are: {pp_text}\n\n"
+		"Answer with a single word: Yes or No."
+	)
+
+
+def vote_confidence(tier, prompt):
+	# self-consistency: sample the schema-constrained answer up to `samples` times,
+	# stopping as soon as the outcome (confident or not) can no longer change
+	samples = tier.get("samples", 5)
+	needed = math.ceil(tier["threshold"] * samples)
+	votes = Counter()
+	calls = 0
+	for seed in range(samples):
+		response = ollama.chat(
+			model = tier["model"],
+			messages = [{'role': 'user', 'content': prompt}],
+			format = answer_schema,
+			options = {"temperature": tier.get("temperature", 0.8), "seed": seed},
+		)
+		calls += 1
+		try:
+			votes[json.loads(response['message']['content'])["answer"]] += 1
+		except (ValueError, KeyError, TypeError):
+			pass  # malformed answer counts as an abstention
+		leader, count = votes.most_common(1)[0] if votes else ("", 0)
+		if count >= needed or count + samples - calls < needed:
+			break
+	return leader, count / samples, calls
+
+
+def logprob_confidence(tier, prompt):
+	# P(Yes) vs P(No) of the first Yes/No token after the schema's {"answer": " prefix;
+	# needs an Ollama server that returns logprobs
+	response = requests.post(ollama_url("/api/chat"), json={
+		"model": tier["model"],
+		"messages": [{'role': 'user', 'content': prompt}],
+		"stream": False,
+		"logprobs": True,
+		"top_logprobs": tier.get("top_logprobs", 5),
+		"format": answer_schema,
+		"options": {"temperature": 0, "num_predict": 10},
+	}, timeout=tier.get("timeout", 120))
+	response.raise_for_status()
+	tokens = response.json().get("logprobs")
+	if not tokens:
+		raise RuntimeError(f"{tier['model']}: server returned no logprobs, use confidence 'vote'")
+	for token in tokens:
+		p = {"Yes": 0.0, "No": 0.0}
+		for alt in token.get("top_logprobs") or [token]:
+			word = alt["token"].strip(' ["{:').capitalize()
+			if word in p:
+				p[word] += math.exp(alt["logprob"])
+		if p["Yes"] + p["No"] > 0:
+			answer = max(p, key=p.get)
+			return answer, p[answer] / (p["Yes"] + p["No"]), 1
+	return "", 0.0, 1
+
+
+class Cascade:
+	# drop-in for query_llm(pp_text, requested_permission)
+
+	def __init__(self, final_ask, final_model, tiers=cascade_tiers):
+		self.final_ask = final_ask
+		self.final_model = final_model
+		self.tiers = tiers
+		self.questions = 0
+		self.reached = Counter()   # questions that got to each tier
+		self.resolved = Counter()  # questions settled at each tier
+		self.calls = Counter()
+		self.seconds = Counter()
+
+	def __call__(self, pp_text, requested_permission):
+		self.questions += 1
+		prompt = screen_prompt(pp_text, requested_permission)
+		for tier in self.tiers:
+			model = tier["model"]
+			confidence_of = logprob_confidence if tier.get("confidence") == "logprobs" else vote_confidence
+			start = time.perf_counter()
+			answer, confidence, calls = confidence_of(tier, prompt)
+			self.seconds[model] += time.perf_counter() - start
+			self.reached[model] += 1
+			self.calls[model] += calls
+			if answer == "No" and confidence >= tier["threshold"]:
+				self.resolved[model] += 1
+				return "[No]"
+			logging.info(f"    {model}: {answer or '?'} ({confidence:.2f}) -> escalate")
+		start = time.perf_counter()
+		response = self.final_ask(pp_text, requested_permission)
+		self.seconds[self.final_model] += time.perf_counter() - start
+		self.reached[self.final_model] += 1
+		self.resolved[self.final_model] += 1
+		self.calls[self.final_model] += 1
+		return response
+
+	def describe(self):
+		tiers = [f"{t['model']}/{t.get('confidence', 'vote')}"
+				 f"{t.get('samples', 5) if t.get('confidence', 'vote') == 'vote' else ''}>={t['threshold']}"
+				 for t in self.tiers]
+		return " > ".join(tiers + [self.final_model])
+
+	def report(self):
+		if not self.questions:
+			return
+		lines = [f"Cascade {self.describe()}: {self.questions} questions"]
+		for model in [t["model"] for t in self.tiers] + [self.final_model]:
+			reached = self.reached[model]
+			lines.append(
+				f"  {model:<16} reached {reached:>6}, settled {self.resolved[model]:>6}"
+				f" ({self.resolved[model] / max(self.questions, 1) * 100:5.1f}% hit rate),"
+				f" {self.calls[model]:>6} calls, {self.seconds[model] / max(reached, 1):.3f}s/question")
+		for line in lines:
+			print(line)
+			logging.info(line)
+
+
+def compare_with_baseline(questions, cascade, baseline_ask):
+	# run every (segment, permission) question through the cascade and the single model,
+	# report latency and how often the Yes/No verdicts agree
+	agree, missed, extra = 0, 0, 0
+	t_cascade = t_baseline = 0.0
+	for pp_text, requested_permission in questions:
+		start = time.perf_counter()
+		ours = 'Yes' in cascade(pp_text, requested_permission)
+		t_cascade += time.perf_counter() - start
+		start = time.perf_counter()
+		theirs = 'Yes' in baseline_ask(pp_text, requested_permission)
+		t_baseline += time.perf_counter() - start
+		agree += ours == theirs
+		missed += theirs and not ours
+		extra += ours and not theirs
+	cascade.report()
+	n = max(len(questions), 1)
+	lines = [
+		f"Latency: cascade {t_cascade:.1f}s ({t_cascade / n:.3f}s/question), "
+		f"single {cascade.final_model} {t_baseline:.1f}s ({t_baseline / n:.3f}s/question), "
+		f"speedup {t_baseline / max(t_cascade, 1e-9):.2f}x",
+		f"Agreement with single-model baseline: {agree}/{len(questions)} ({agree / n * 100:.1f}%); "
+		f"baseline Yes screened out: {missed}, cascade-only Yes: {extra}",
+	]
+	for line in lines:
+		print(line)
+		logging.info(line)
@@ -0,0 +1,197 @@
+import re
+import hashlib
+import logging
+import unicodedata
+import numpy as np
+
+# Corpus-level de-duplication of privacy-policy segments.
+# Apps from the same vendor / template ship the same policy, so most
+# (segment, permission) questions in llm_analyze_pp are repeats. Segments are
+# normalised, grouped by exact hash, then near-duplicates (template with another
+# company name, OCR noise) are merged with MinHash + LSH; each (cluster, permission)
+# question is sent to the LLM once and its answer is shared by every member. Exact
+# duplicates reuse the answer verbatim; near-duplicates share only its Yes/No, and
+# the supporting sentences are re-quoted from the member's own segment. A "Yes" none
+# of whose sentences has a close match in the member is asked again for that member.
+
+NUM_PERM = 128        # MinHash signature length
+LSH_BANDS = 32        # 32 bands x 4 rows: pairs above ~0.6 Jaccard almost always collide
+SHINGLE_WORDS = 3     # word n-gram shingles
+SIM_THRESHOLD = 0.8   # estimated Jaccard to the cluster representative needed to share its verdict
+EVIDENCE_MATCH = 0.5  # word Jaccard for a member sentence to stand in for a quoted one
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.RandomState(42)
+_A = _rng.randint(1, _PRIME, size=NUM_PERM, dtype=np.uint64)
+_B = _rng.randint(0, _PRIME, size=NUM_PERM, dtype=np.uint64)
+
+
+def normalize_segment(text):
+	# case, unicode forms, punctuation and whitespace differences don't change a verdict
+	text = unicodedata.normalize("NFKC", text).lower()
+	return " ".join(re.sub(r"[^\w]+", " ", text).split())
+
+
+def shingles(norm_text, k=SHINGLE_WORDS):
+	words = norm_text.split()
+	if len(words) <= k:
+		return {norm_text}
+	return {" ".join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+
+def minhash(norm_text):
+	hv = np.array([int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little")
+				   for s in shingles(norm_text)], dtype=np.uint64)
+	# (a*h + b) mod p per permutation; a, h < 2^31 so the product fits in uint64
+	return ((np.outer(_A, hv) + _B[:, None]) % _PRIME).min(axis=1)
+
+
+def sentences(text):
+	return [s.strip() for s in re.split(r"(?<=[.!?])\s+|\n", text) if s.strip()]
+
+
+def requote(answer, own_text, min_sim=EVIDENCE_MATCH):
+	# the representative's answer for a near-duplicate member: same Yes/No, but every
+	# quoted sentence replaced by the member's closest sentence (dropped if none is close);
+	# None for a "Yes" that keeps no supporting sentence, which the member must ask itself
+	if 'Yes' not in answer:
+		return "[No]" if 'No' in answer else answer
+	own = [(s, set(normalize_segment(s).split())) for s in sentences(own_text)]
+	quoted = []
+	for sent in sentences(answer.split("[Yes]", 1)[-1]):
+		words = set(normalize_segment(sent).split())
+		sims = [(len(words & w) / max(len(words | w), 1), s) for s, w in own]
+		sim, best = max(sims, default=(0, ""))
+		if sim >= min_sim and best not in quoted:
+			quoted.append(best)
+	return " ".join(["[Yes]"] + quoted) if quoted else None
+
+
+class SegmentIndex:
+	# exact-hash + MinHash/LSH clustering; the first segment of a cluster is its representative
+
+	def __init__(self, threshold=SIM_THRESHOLD, near=True, bands=LSH_BANDS):
+		self.threshold = threshold
+		self.near = near
+		self.bands = bands
+		self.rows = NUM_PERM // bands
+		self.exact = {}        # normalised-text hash -> cluster id
+		self.buckets = {}      # (band, band signature) -> [cluster id]
+		self.signatures = []   # per cluster, of its representative
+		self.sizes = []        # segments per cluster
+		self.n_segments = 0
+		self.n_exact = 0
+
+	def cluster(self, text):
+		self.n_segments += 1
+		norm = normalize_segment(text)
+		key = hashlib.sha1(norm.encode("utf-8")).hexdigest()
+		if key in self.exact:
+			cid = self.exact[key]
+			self.sizes[cid] += 1
+			return cid
+		self.n_exact += 1
+		sig = minhash(norm) if self.near else None
+		cid = self._near_match(sig) if self.near else None
+		if cid is None:
+			cid = len(self.sizes)
+			self.signatures.append(sig)
+			self.sizes.append(0)
+			if self.near:
+				for band in self._bands(sig):
+					self.buckets.setdefault(band, []).append(cid)
+		self.exact[key] = cid
+		self.sizes[cid] += 1
+		return cid
+
+	def _bands(self, sig):
+		return [(b, sig[b * self.rows:(b + 1) * self.rows].tobytes()) for b in range(self.bands)]
+
+	def _near_match(self, sig):
+		candidates = {cid for band in self._bands(sig) for cid in self.buckets.get(band, ())}
+		best, best_sim = None, self.threshold
+		for cid in sorted(candidates):
+			sim = float(np.mean(self.signatures[cid] == sig))
+			if sim >= best_sim:
+				best, best_sim = cid, sim
+		return best
+
+	@property
+	def n_clusters(self):
+		return len(self.sizes)
+
+
+class SharedVerdicts:
+	# drop-in for query_llm: asks once per (segment cluster, permission), reuses the answer
+
+	def __init__(self, ask, index):
+		self.ask = ask
+		self.index = index
+		self.cluster_of = {}      # raw segment text -> cluster id
+		self.representative = {}  # cluster id -> text sent to the LLM
+		self.answers = {}
+		self.own_answers = {}     # (member text, permission) -> answer, when requote found no support
+		self.requoted = 0         # answers handed to near-duplicates with their own evidence
+		self.questions = 0
+		self.corpus = None
+
+	def add_corpus(self, docs):
+		# cluster every app's segments up front; the counts cover the whole dataset,
+		# whether or not its apps are (re)analysed in this run
+		questions, pairs = 0, set()
+		for doc in docs:
+			perms = doc.get("requested_permissions", [])
+			for seg in doc.get("pp_segments", []):
+				cid = self.index.cluster(seg)
+				self.cluster_of.setdefault(seg, cid)
+				self.representative.setdefault(cid, seg)
+				questions += len(perms)
+				pairs.update((cid, p) for p in perms)
+		self.corpus = {"questions": questions, "llm_calls": len(pairs)}
+
+	def cluster(self, seg):
+		if seg not in self.cluster_of:
+			cid = self.index.cluster(seg)
+			self.cluster_of[seg] = cid
+			self.representative.setdefault(cid, seg)
+		return self.cluster_of[seg]
+
+	def __call__(self, pp_text, requested_permission):
+		self.questions += 1
+		cid = self.cluster(pp_text)
+		key = (cid, requested_permission)
+		rep = self.representative[cid]
+		if key not in self.answers:
+			self.answers[key] = self.ask(rep, requested_permission)
+		if pp_text == rep or normalize_segment(pp_text) == normalize_segment(rep):
+			return self.answers[key]
+		answer = requote(self.answers[key], pp_text)
+		if answer is not None:
+			self.requoted += 1
+			return answer
+		own = (pp_text, requested_permission)
+		if own not in self.own_answers:
+			self.own_answers[own] = self.ask(pp_text, requested_permission)
+		return self.own_answers[own]
+
+	def report(self):
+		idx = self.index
+		lines = [
+			f"Segments: {idx.n_segments} total, {idx.n_exact} exact-unique, {idx.n_clusters} clusters"
+			f" -> de-dup ratio {idx.n_segments / max(idx.n_clusters, 1):.2f}x"
+			f" ({(1 - idx.n_clusters / max(idx.n_segments, 1)) * 100:.1f}% duplicates)",
+		]
+		calls = len(self.answers) + len(self.own_answers)
+		runs = [("This run", self.questions, calls)] if self.questions else []
+		if self.corpus:
+			runs.insert(0, ("Full dataset", self.corpus["questions"], self.corpus["llm_calls"]))
+		for label, questions, calls in runs:
+			lines.append(f"{label}: {questions} segment x permission questions, {calls} LLM calls,"
+						 f" {questions - calls} avoided ({(1 - calls / max(questions, 1)) * 100:.1f}%)")
+		if self.requoted:
+			lines.append(f"Near-duplicate answers re-quoted from the member's own segment: {self.requoted}")
+		if self.own_answers:
+			lines.append(f"Near-duplicate Yes without support in the member, asked again: {len(self.own_answers)}")
+		for line in lines:
+			print(line)
+			logging.info(line)
@@ -1,14 +1,21 @@
 import os
+import json
+import hashlib
+import inspect
+import argparse
 import ollama
 from pymongo import MongoClient
 import logging
 import numpy as np
 import pandas as pd
 import easyocr
+from dedup import SegmentIndex, SharedVerdicts, SIM_THRESHOLD
+from cascade import Cascade, cascade_tiers, screen_prompt, vote_confidence, logprob_confidence, compare_with_baseline
 
 pp_txt_root = "pp_txt"
 pp_png_root = "pp_png"
 permission_png_root = "permission_png"
+llm_model = "gemma3"
 
 all_permissions = ['Distance', 'Exercise', 'Blood pressure', 'Body fat', 'Heart rate', 'Weight', 'Active calories burned', 
 				   'Total calories burned', 'Resting heart rate', 'Steps', 'Floors climbed', 'Sleep', 'Heart rate variability', 'Basal body temperature', 
@@ -49,6 +56,52 @@ def segment_policy(pp_text, max_words=250):
 	return segments
 
 
+def pp_image_paths(app_name):
+	# pp_1.png, pp_2.png, ... in page order
+	app_path = os.path.join(pp_png_root, app_name)
+	if not os.path.isdir(app_path):
+		return []
+	image_files = sorted(
+		[f for f in os.listdir(app_path) if f.startswith("pp_") and f.endswith(".png")],
+		key=lambda x: int(x.split("_")[1].split(".")[0])
+	)
+	return [os.path.join(app_path, f) for f in image_files]
+
+
+def permission_image_paths(app_name):
+	app_path = os.path.join(permission_png_root, app_name)
+	if not os.path.isdir(app_path):
+		return []
+	return [os.path.join(app_path, f) for f in sorted(os.listdir(app_path)) if f.lower().endswith('.png')]
+
+
+def ocr_pp_images(images):
+	# one text per policy page; `images` are file paths or PNG bytes
+	transcribed_texts = []
+	for image in images:
+		try:
+			result = reader.readtext(image, detail=0, paragraph=True)
+			transcribed_texts.append("\n".join(result).strip())
+		except Exception as e:
+			name = image if isinstance(image, str) else "in-memory capture"
+			print(f"Error processing {name}: {e}")
+			logging.info(f"Error processing {name}: {e}")
+			transcribed_texts.append("")
+	return transcribed_texts
+
+
+def ocr_permission_images(images):
+	transcribed_texts = []
+	for image in images:
+		try:
+			result = reader.readtext(image, detail=0)
+			transcribed_texts.append('\n'.join(result))
+		except Exception as e:
+			name = image if isinstance(image, str) else "in-memory capture"
+			logging.info(f"Error processing {name}: {e}")
+	return extract_permissions('\n'.join(transcribed_texts))
+
+
 def transcribe_pp_screenshot():
 	myclient = MongoClient("mongodb://localhost:27017/")
 	mydb = myclient["hc_pp"]
@@ -70,26 +123,9 @@ def transcribe_pp_screenshot():
 		if not os.path.isdir(app_path):
 			continue
 
-		transcribed_texts = []
-		image_files = sorted(
-			[f for f in os.listdir(app_path) if f.startswith("pp_") and f.endswith(".png")],
-			key=lambda x: int(x.split("_")[1].split(".")[0])
-		)
-
 		if app_name in processed_apps:
 			continue
-		for image_file in image_files:
-			image_path = os.path.join(app_path, image_file)
-			try:
-				result = reader.readtext(image_path, detail=0, paragraph=True)
-				combined_text = "\n".join(result).strip()
-				transcribed_texts.append(combined_text)
-				
-			except Exception as e:
-				print(f"Error processing {image_path}: {e}")
-				logging.info(f"Error processing {image_path}: {e}")
-				transcribed_texts.append("")
-			# logging.info(f"----------------------------------------")
+		transcribed_texts = ocr_pp_images(pp_image_paths(app_name))
 		doc = {
 			"packagename": app_name,
 			"pp_segments": transcribed_texts
@@ -147,6 +183,60 @@ def partition_pp_txt():
 	# logging.info(f"========================================================\n")
 	myclient.close()
 
+def extract_permissions(full_text):
+	# keep the OCR lines listed under "Allowed to read/write" that are known HC permissions
+	extracted_permission = []
+	start_extraction = False
+	for line in full_text.split('\n'):
+		if "Allowed to read" in line or "Allowed to write" in line:
+			start_extraction = True
+		elif "Manage app" in line:
+			start_extraction = False
+
+		if start_extraction and len(line.strip()) > 3 and not line[0].isdigit() and "access" not in line and "ennee" not in line:
+			extracted_permission.append(line.strip())
+
+	requested_permissions = []
+	for p in set(extracted_permission):
+		if p in all_permissions:
+			requested_permissions.append(p)
+	return requested_permissions
+
+
+def ingest_capture(app_name, kind, images):
+	# in-process handoff from RQ1/ui_driver.py --ocr: `images` are the PNG bytes of the
+	# policy page (kind "pp") or the app's HC permission list (kind "permission"), one per
+	# scroll position, OCRed together straight from memory instead of pp_png/ /
+	# permission_png/ on disk. pp_segments from a richer source (pp_txt/, multi-page
+	# pp_png/, or stored before build records) are kept rather than replaced
+	client = MongoClient("mongodb://localhost:27017/")
+	collection = client["hc_pp"]["RQ3"]
+	try:
+		capture = {"capture": [content_hash(image) for image in images]}
+		if kind == "pp":
+			doc = collection.find_one({"packagename": app_name}) or {}
+			source = doc.get("build", {}).get("pp_segments", {}).get("inputs", {})
+			if "pp_segments" in doc and "capture" not in source:
+				logging.info(f"  Keep {app_name} pp_segments from {', '.join(source) or 'the database'}, skip the capture")
+				return
+			update = {"pp_segments": ocr_pp_images(images),
+					  "build.pp_segments": build_record(capture, code_version(ocr_pp_images), ocr_version())}
+		elif kind == "permission":
+			update = {"requested_permissions": ocr_permission_images(images),
+					  "build.requested_permissions": build_record(capture,
+																   code_version(ocr_permission_images, extract_permissions),
+																   ocr_version())}
+		else:
+			raise ValueError(f"unknown capture kind {kind}")
+		collection.update_one({"packagename": app_name}, {"$set": update}, upsert=True)
+		logging.info(f"  Ingested {kind} capture for {app_name} ({len(images)} screenshots)")
+	except Exception as e:
+		print(f"Error processing {kind} capture of {app_name}: {e}")
+		logging.info(f"Error processing {kind} capture of {app_name}: {e}")
+	finally:
+		client.close()
+
+
 def transcribe_permission_screenshot():
     client = MongoClient('mongodb://localhost:27017/')  # Update URI if needed
     db = client['hc_pp']  # Replace with your DB name
@@ -166,36 +256,8 @@ def transcribe_permission_screenshot():
             logging.info(f"[{idx}] skip {subfolder}")
             continue
 
-        transcribed_texts = []
-
         # OCR each .png file in the subfolder
-        filenames = sorted([f for f in os.listdir(subfolder_path) if f.endswith('.png')])
-        for filename in filenames:
-            if filename.lower().endswith('.png'):
-                img_path = os.path.join(subfolder_path, filename)
-                try:
-                    result = reader.readtext(img_path, detail=0)
-                    transcribed_texts.append('\n'.join(result))
-                    
-                except Exception as e:
-                    logging.info(f"Error processing {img_path}: {e}")
-
-        full_text = '\n'.join(transcribed_texts)
-        extracted_permission = []
-        start_extraction = False
-        for line in full_text.split('\n'):
-            if "Allowed to read" in line or "Allowed to write" in line:
-                start_extraction = True
-            elif "Manage app" in line:
-                start_extraction = False
-            
-            if start_extraction and len(line.strip()) > 3 and not line[0].isdigit() and "access" not in line and "ennee" not in line:
-                extracted_permission.append(line.strip())
-
-        requested_permissions = []
-        for p in set(extracted_permission):
-            if p in all_permissions:
-                requested_permissions.append(p)
+        requested_permissions = ocr_permission_images(permission_image_paths(subfolder))
 
         collection.update_one(
             {"packagename": subfolder},
@@ -217,7 +279,7 @@ def query_llm(pp_text, requested_permission):
 	)
 	# print(f"prompt: {[prompt]}")
 	response = ollama.chat(
-		model = 'gemma3',
+		model = llm_model,
 		messages = [
 			{'role': 'user', 'content': prompt}
 		]
@@ -225,13 +287,98 @@ def query_llm(pp_text, requested_permission):
 	return response['message']['content']
 
 
-def llm_analyze_pp():
+def analyze_app(pp_segments, requested_permissions, ask=query_llm):
+	# ask the LLM about every permission × segment; returns the verdict fields stored per app
+	rationale_flags, rationale_reasoning = [], []
+	for per in requested_permissions:
+		rationale_flag = False
+		rationale_sents = ''
+		for pp_seg in pp_segments:
+			response = ask(pp_seg, per)
+			if 'Yes' in response:
+				rationale_flag = True
+				rationale_sents += response
+			elif 'No' in response:
+				continue
+			else:
+				print(f"[Error] output: {response}")
+				logging.info(f"[Error] response: {response}")
+		if rationale_flag:
+			rationale_reasoning.append(rationale_sents)
+			logging.info(f"  ✅ rationale for {per}")
+		else:
+			rationale_reasoning.append('')
+			logging.info(f"  ❌ rationale for {per}")
+
+		rationale_flags.append(rationale_flag)
+
+	if rationale_flags.count(True) == 0:  #non disclosure
+		rationale_overall = "Non Disclosure"
+	elif rationale_flags.count(True) != len(requested_permissions):
+		rationale_overall = "Partial Disclosure"
+	else:
+		rationale_overall = "Comprehensive Disclosure"
+	return {"gemma_rationale_overall": rationale_overall,
+			"gemma_rationale_reasoning": rationale_reasoning,
+			"rationale_flags": rationale_flags}
+
+
+analysable = {"pp_segments": {"$exists": True, "$type": "array"}, "requested_permissions": {"$exists": True}}
+
+
+def shared_verdicts(collection, threshold=SIM_THRESHOLD, ask=query_llm):
+	# `ask` behind corpus-level segment de-duplication (see dedup.py);
+	# threshold=None shares verdicts between exact duplicates only
+	shared = SharedVerdicts(ask, SegmentIndex(threshold=threshold or 1.0, near=threshold is not None))
+	shared.add_corpus(collection.find(analysable, {"pp_segments": 1, "requested_permissions": 1}))
+	return shared
+
+
+def analysis_asker(collection, dedup=False, threshold=SIM_THRESHOLD, tiers=None):
+	# query_llm, optionally behind the small-to-large model cascade (see cascade.py)
+	# and / or verdict sharing between duplicate segments
+	ask = Cascade(query_llm, llm_model, tiers) if tiers else query_llm
+	return shared_verdicts(collection, threshold, ask) if dedup else ask
+
+
+def report_asker(ask):
+	if isinstance(ask, SharedVerdicts):
+		ask.report()
+		ask = ask.ask
+	if isinstance(ask, Cascade):
+		ask.report()
+
+
+def cascade_report(tiers=cascade_tiers, limit=200):
+	# tier hit rates, latency and agreement with the single-model baseline on the first
+	# `limit` permission × segment questions of the dataset
+	client = MongoClient("mongodb://localhost:27017/")
+	logging.info(f"==================== Cascade report ====================")
+	questions = []
+	for doc in client["hc_pp"]["RQ3"].find(analysable):
+		questions += [(seg, per) for per in doc["requested_permissions"] for seg in doc["pp_segments"]]
+		if len(questions) >= limit:
+			break
+	compare_with_baseline(questions[:limit], Cascade(query_llm, llm_model, tiers), query_llm)
+	client.close()
+
+
+def dedup_report(threshold=SIM_THRESHOLD):
+	# de-dup ratio and LLM calls avoided over the full dataset, without querying the LLM
+	client = MongoClient("mongodb://localhost:27017/")
+	logging.info(f"==================== De-dup report ====================")
+	shared_verdicts(client["hc_pp"]["RQ3"], threshold).report()
+	client.close()
+
+
+def llm_analyze_pp(dedup=False, threshold=SIM_THRESHOLD, tiers=None):
 
 	client = MongoClient("mongodb://localhost:27017/")
 	db = client["hc_pp"]
 	collection = db["RQ3"]
 	# main_collection = db["pp_screenshot"]
 	logging.info(f"==================== LLM analyze PP ====================")
+	ask = analysis_asker(collection, dedup, threshold, tiers)
 	comp_dis, part_dis, non_dis = 0, 0, 0
 	app_id = 0
 
@@ -244,70 +391,238 @@ def llm_analyze_pp():
 	packagenames_with_rationale = [doc["packagename"] for doc in cursor]
 	print(f" Total {len(packagenames_with_rationale)} apps have rationale analysis in database")
 
-	for doc in collection.find({"pp_segments": {"$exists": True, "$type": "array"}, "requested_permissions": {"$exists": True}}):
+	for doc in collection.find(analysable):
 		app_id += 1
 		if doc["packagename"] in packagenames_with_rationale:
 			logging.info(f"[{app_id}] Skip {doc['packagename']}: {doc['gemma_rationale_overall']}")
 			continue
-		pp_segments = doc.get("pp_segments", [])
-		requested_permissions = doc.get("requested_permissions", [])
-		rationale_flags, rationale_reasoning = [], []
-		logging.info(f"[{app_id}] {doc['packagename']} {len(requested_permissions)} permissions")
-		for per in requested_permissions:
-			rationale_flag = False
-			rationale_sents = ''
-			for pp_seg in pp_segments:
-				response = query_llm(pp_seg, per)
-				if 'Yes' in response:
-					rationale_flag = True
-					rationale_sents += response
-				elif 'No' in response:
-					continue
-				else:
-					print(f"[Error] output: {response}")
-					logging.info(f"[Error] response: {response}")
-			if rationale_flag:
-				rationale_reasoning.append(rationale_sents)
-				logging.info(f"  ✅ rationale for {per}")
-			else:
-				rationale_reasoning.append('')
-				logging.info(f"  ❌ rationale for {per}")
-
-			rationale_flags.append(rationale_flag)
-		
-		logging.info(f"Update to database ...")
-		rationale_overall = ""
-		if rationale_flags.count(True) == 0:  #non disclosure
+		logging.info(f"[{app_id}] {doc['packagename']} {len(doc.get('requested_permissions', []))} permissions")
+		verdict = analyze_app(doc.get("pp_segments", []), doc.get("requested_permissions", []), ask)
+		rationale_overall = verdict["gemma_rationale_overall"]
+		if rationale_overall == "Non Disclosure":
 			non_dis += 1
-			rationale_overall = "Non Disclosure"
-		elif rationale_flags.count(True) != len(requested_permissions):
+		elif rationale_overall == "Partial Disclosure":
 			part_dis += 1
-			rationale_overall = "Partial Disclosure"
 		else:
 			comp_dis += 1
-			rationale_overall = "Comprehensive Disclosure"
 
+		logging.info(f"Update to database ...")
 		collection.update_one(
             {"_id": doc["_id"]},
-            {"$set": {"gemma_rationale_overall": rationale_overall,
-					  "gemma_rationale_reasoning": rationale_reasoning,
-					  "rationale_flags": rationale_flags
-					  }}
+            {"$set": verdict}
         )
 
 		logging.info(f"✅✅ successfully update {doc['packagename']}: {rationale_overall}")
 
+	report_asker(ask)
 	total_pp = comp_dis+part_dis+non_dis
 	print(f"Total {total_pp} privacy policies: {comp_dis} ({comp_dis/total_pp*100}\%) comprehensive; \
 			{part_dis} ({part_dis/total_pp*100}\%) partial; {non_dis} ({non_dis/total_pp*100} \%) non disclosure")
 	client.close()
 	# logging.info(f"========================================================\n")
 
-def main():
+# ==================== Incremental build ====================
+# Each per-app artifact (pp_segments, requested_permissions, gemma verdict) keeps a
+# build.<stage> record in its Mongo doc: hashes of its inputs, the hash of the code
+# that produced it and the model. A stage reruns only when that record changes, and
+# the verdict's inputs are the hashes of pp_segments / requested_permissions
+# themselves, so a re-captured image whose OCR text is unchanged stops there.
+
+def content_hash(value):
+	# sha256 of bytes, or of the JSON form of anything else
+	if not isinstance(value, bytes):
+		value = json.dumps(value, sort_keys=True, ensure_ascii=False).encode("utf-8")
+	return hashlib.sha256(value).hexdigest()
+
+
+def file_hash(path):
+	with open(path, "rb") as f:
+		return content_hash(f.read())
+
+
+def code_version(*funcs):
+	# editing a stage (or the prompt in query_llm) changes its code version
+	return content_hash("".join(inspect.getsource(f) for f in funcs))
+
+
+def ocr_version():
+	return f"easyocr-{easyocr.__version__}"
+
+
+def model_version(model):
+	# tag + local digest, so re-pulling 'gemma3' counts as a model change
+	try:
+		for m in ollama.list()["models"]:
+			name = m.get("model") or m.get("name")
+			if name in (model, f"{model}:latest"):
+				return f"{model}@{m['digest'][:12]}"
+	except Exception as e:
+		logging.info(f"Cannot read digest of {model}: {e}")
+	return model
+
+
+def build_record(inputs, code, model=None):
+	return {"inputs": inputs, "code": code, "model": model}
+
+
+def stale_reason(old, new):
+	# None when up to date, else what changed
+	if not old:
+		return "no build record"
+	inputs = sorted(old["inputs"].keys() | new["inputs"].keys())
+	changed = [f"{k} changed" for k in inputs if old["inputs"].get(k) != new["inputs"].get(k)]
+	changed += [f"{k} changed" for k in ("code", "model") if old.get(k) != new[k]]
+	return ", ".join(changed) or None
+
+
+def pp_segments_stage(app_name):
+	# (record, build) from pp_txt/<app>.txt, else pp_png/<app>/pp_*.png; None without a source
+	txt_path = os.path.join(pp_txt_root, app_name + ".txt")
+	if os.path.isfile(txt_path):
+		def build():
+			with open(txt_path, 'r', encoding='utf-8') as f:
+				return {"pp_segments": segment_policy(f.read())}
+		return build_record({"pp_txt": file_hash(txt_path)}, code_version(segment_policy)), build
+	images = pp_image_paths(app_name)
+	if images:
+		record = build_record({"pp_png": {os.path.basename(p): file_hash(p) for p in images}},
+							  code_version(ocr_pp_images), ocr_version())
+		return record, lambda: {"pp_segments": ocr_pp_images(images)}
+	return None
+
+
+def permissions_stage(app_name):
+	images = permission_image_paths(app_name)
+	if not images:
+		return None
+	record = build_record({"permission_png": {os.path.basename(p): file_hash(p) for p in images}},
+						  code_version(ocr_permission_images, extract_permissions), ocr_version())
+	return record, lambda: {"requested_permissions": ocr_permission_images(images)}
+
+
+def rationale_stage(doc, llm, code, ask=query_llm):
+	if not isinstance(doc.get("pp_segments"), list) or "requested_permissions" not in doc:
+		return None
+	inputs = {"pp_segments": content_hash(doc["pp_segments"]),
+			  "requested_permissions": content_hash(doc["requested_permissions"])}
+	if isinstance(ask, SharedVerdicts):
+		# with --dedup a segment's answer is its cluster representative's
+		inputs["representatives"] = content_hash([ask.representative[ask.cluster(seg)] for seg in doc["pp_segments"]])
+	record = build_record(inputs, code, llm)
+	return record, lambda: analyze_app(doc["pp_segments"], doc["requested_permissions"], ask)
+
+
+def incremental_build(dry_run=False, adopt=False, dedup=False, threshold=SIM_THRESHOLD, tiers=None):
+	# rebuild only the per-app artifacts whose recorded inputs / code / model changed;
+	# dry_run lists them instead, adopt stamps records onto existing un-recorded outputs,
+	# dedup shares verdicts of duplicate segments across the rebuilt apps, tiers runs
+	# the questions through the model cascade (which then counts as the verdict's model)
+	client = MongoClient("mongodb://localhost:27017/")
+	collection = client["hc_pp"]["RQ3"]
+	# built in dry runs too (no LLM calls): the verdict records need its clusters
+	ask = analysis_asker(collection, dedup, threshold, tiers)
+	logging.info(f"==================== Incremental build{' (dry run)' if dry_run else ''} ====================")
+	apps = set(collection.distinct('packagename'))
+	apps |= {f[:-4] for f in os.listdir(pp_txt_root) if f.endswith('.txt')}
+	for root in (pp_png_root, permission_png_root):
+		apps |= {d for d in os.listdir(root) if os.path.isdir(os.path.join(root, d))}
+	outputs = {"pp_segments": "pp_segments", "requested_permissions": "requested_permissions",
+			   "rationale": "gemma_rationale_overall"}
+	llm = model_version(llm_model)
+	funcs = [query_llm, analyze_app]
+	if tiers:
+		llm = Cascade(query_llm, llm, tiers).describe()
+		funcs += [screen_prompt, vote_confidence, logprob_confidence, Cascade]
+	if dedup:
+		# the whole dedup module: clustering, requote and their constants
+		llm = f"{llm} dedup@{threshold if threshold is not None else 'exact'}"
+		funcs.append(inspect.getmodule(SharedVerdicts))
+	code = code_version(*funcs)
+	rebuilt, kept = {stage: 0 for stage in outputs}, {stage: 0 for stage in outputs}
+
+	for app_name in sorted(apps):
+		doc = collection.find_one({"packagename": app_name}) or {"packagename": app_name}
+		records = doc.get("build", {})
+		upstream_changed = False
+		for stage in outputs:
+			if stage == "rationale":
+				if dry_run and upstream_changed:
+					print(f"  maybe   {app_name} rationale (if the rebuilt inputs differ)")
+					rebuilt[stage] += 1
+					continue
+				planned = rationale_stage(doc, llm, code, ask)
+			else:
+				planned = (pp_segments_stage if stage == "pp_segments" else permissions_stage)(app_name)
+			if planned is None:
+				continue
+			record, build = planned
+			reason = stale_reason(records.get(stage), record)
+			if reason == "no build record" and adopt and outputs[stage] in doc:
+				if not dry_run:
+					collection.update_one({"packagename": app_name}, {"$set": {f"build.{stage}": record}})
+				reason = None
+			if reason is None:
+				kept[stage] += 1
+				continue
+			rebuilt[stage] += 1
+			upstream_changed = True
+			print(f"  rebuild {app_name} {stage} ({reason})")
+			logging.info(f"  rebuild {app_name} {stage} ({reason})")
+			if dry_run:
+				continue
+			update = build()
+			update[f"build.{stage}"] = record
+			collection.update_one({"packagename": app_name}, {"$set": update}, upsert=True)
+			doc.update(update)
+
+	for stage in outputs:
+		print(f"{stage}: {rebuilt[stage]} {'to rebuild' if dry_run else 'rebuilt'}, {kept[stage]} up to date")
+		logging.info(f"{stage}: {rebuilt[stage]} {'to rebuild' if dry_run else 'rebuilt'}, {kept[stage]} up to date")
+	if not dry_run:
+		report_asker(ask)
+	client.close()
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description="RQ3 privacy-policy rationale analysis")
+	parser.add_argument("--incremental", action="store_true", help="rebuild only artifacts whose inputs, code or model changed")
+	parser.add_argument("--dry-run", action="store_true", help="with --incremental, only list what would rebuild")
+	parser.add_argument("--adopt", action="store_true", help="with --incremental, record existing results as up to date instead of recomputing them")
+	parser.add_argument("--dedup", action="store_true", help="ask once per (near-)duplicate segment cluster and permission, share the verdict across apps")
+	parser.add_argument("--exact-only", action="store_true", help="with --dedup, share verdicts between exact duplicates only")
+	parser.add_argument("--dedup-report", action="store_true", help="print the de-dup ratio and LLM calls avoided over the dataset and exit")
+	parser.add_argument("--cascade", action="store_true", help="screen questions with small models first, escalate uncertain / positive ones to " + llm_model)
+	parser.add_argument("--tier", action="append", metavar="MODEL[@THRESHOLD]", help="screening tier, in order (repeatable; default: " + ", ".join(f"{t['model']}@{t['threshold']}" for t in cascade_tiers) + ")")
+	parser.add_argument("--confidence", choices=("vote", "logprobs"), help="screening confidence: self-consistency votes or Yes/No token log-probs")
+	parser.add_argument("--samples", type=int, help="votes per question for --confidence vote")
+	parser.add_argument("--cascade-report", action="store_true", help="compare the cascade with the single-model baseline (tier hit rates, latency, agreement) and exit")
+	parser.add_argument("--limit", type=int, default=200, help="questions for --cascade-report")
+	args = parser.parse_args(argv)
+	threshold = None if args.exact_only else SIM_THRESHOLD
+	tiers = None
+	if args.cascade or args.cascade_report:
+		tiers = [dict(t) for t in cascade_tiers]
+		if args.tier:
+			tiers = [{"model": m, "threshold": float(th) if th else 0.8}
+					 for m, _, th in (t.partition("@") for t in args.tier)]
+		for tier in tiers:
+			if args.confidence:
+				tier["confidence"] = args.confidence
+			if args.samples:
+				tier["samples"] = args.samples
+	if args.dedup_report:
+		dedup_report(threshold)
+		return
+	if args.cascade_report:
+		cascade_report(tiers, args.limit)
+		return
+	if args.incremental:
+		incremental_build(dry_run=args.dry_run, adopt=args.adopt, dedup=args.dedup, threshold=threshold, tiers=tiers)
+		return
 	partition_pp_txt()
 	transcribe_pp_screenshot()
 	transcribe_permission_screenshot()
-	llm_analyze_pp()
+	llm_analyze_pp(dedup=args.dedup, threshold=threshold, tiers=tiers)
 
 if __name__ == "__main__":
 	main()
@@ -0,0 +1,143 @@
+import re
+import sys
+import json
+import math
+import time
+import random
+import hashlib
+import argparse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Mock Ollama server for exercising the RQ3 model cascade without GPUs:
+#
+#   python mock_ollama.py --port 11435 --latency gemma3=0.4 --latency gemma3:1b=0.05
+#   OLLAMA_HOST=http://127.0.0.1:11435 python llm_analysis.py --cascade-report
+#
+# /api/chat answers the query_llm / screening prompts from a keyword rule: a quoted
+# sentence that names the permission and gives a purpose cue is a rationale. The
+# large model (--large) is always right and returns "[Yes] <sentence>" / "[No]";
+# smaller models answer Yes with a probability that depends on how clear the case
+# is, seeded per (model, text, permission, seed) so runs are repeatable. Supports
+# `format` (JSON answer), `options.seed` sampling and `logprobs` / `top_logprobs`.
+
+purpose_cues = ("to ", "so that", "because", "in order", "used for", "use it", "purpose", "help")
+clear_yes, unclear, clear_no = 0.9, 0.45, 0.03   # P(Yes) of a small model
+
+prompt_patterns = [
+	re.compile(r"rationales specific for (?P<perm>.+?) — that is.*?The quoted sentences are: (?P<text>.*)\n\n", re.S),
+]
+
+
+def parse_prompt(prompt):
+	for pattern in prompt_patterns:
+		m = pattern.search(prompt)
+		if m:
+			return m.group("perm"), m.group("text")
+	return "", prompt
+
+
+def rationale_sentences(text, perm):
+	sentences = [s.strip() for s in re.split(r"[.\n]", text) if s.strip()]
+	mentions = [s for s in sentences if perm.lower() in s.lower()]
+	return [s for s in mentions if any(c in s.lower() for c in purpose_cues)], mentions
+
+
+def p_yes(text, perm):
+	rationale, mentions = rationale_sentences(text, perm)
+	return clear_yes if rationale else unclear if mentions else clear_no
+
+
+def sample_yes(model, text, perm, seed):
+	key = hashlib.sha256(f"{model}|{perm}|{seed}|{text}".encode("utf-8")).digest()
+	return random.Random(key).random() < p_yes(text, perm)
+
+
+class Handler(BaseHTTPRequestHandler):
+	config = None
+
+	def log_message(self, *args):
+		pass
+
+	def reply(self, body, status=200):
+		data = json.dumps(body).encode("utf-8")
+		self.send_response(status)
+		self.send_header("Content-Type", "application/json")
+		self.send_header("Content-Length", str(len(data)))
+		self.end_headers()
+		self.wfile.write(data)
+
+	def do_GET(self):
+		if self.path.rstrip("/") != "/api/tags":
+			return self.reply({"error": "not found"}, 404)
+		models = sorted(set(self.config["latency"]) | {self.config["large"]})
+		self.reply({"models": [{"name": m, "model": m, "size": 0,
+								"digest": hashlib.sha256(m.encode()).hexdigest()} for m in models]})
+
+	def do_POST(self):
+		if self.path.rstrip("/") != "/api/chat":
+			return self.reply({"error": "not found"}, 404)
+		req = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+		model = req.get("model", "")
+		perm, text = parse_prompt(req["messages"][-1]["content"])
+		start = time.perf_counter()
+		time.sleep(self.config["latency"].get(model, self.config["default_latency"]))
+
+		logprobs = None
+		if model == self.config["large"]:
+			rationale, _ = rationale_sentences(text, perm)
+			answer = "Yes" if rationale else "No"
+			content = f"[Yes] {'. '.join(rationale)}." if rationale else "[No] The text does not explain this."
+		else:
+			seed = (req.get("options") or {}).get("seed", 0)
+			answer = "Yes" if sample_yes(model, text, perm, seed) else "No"
+			content = json.dumps({"answer": answer}) if req.get("format") else answer
+			if req.get("logprobs"):
+				p = min(max(p_yes(text, perm), 1e-6), 1 - 1e-6)
+				top = [{"token": "Yes", "logprob": math.log(p)}, {"token": "No", "logprob": math.log(1 - p)}]
+				top.sort(key=lambda t: -t["logprob"])
+				answer = top[0]["token"]
+				logprobs = [dict(top[0], top_logprobs=top[:req.get("top_logprobs", 5)])]
+				if req.get("format"):
+					# the schema's {"answer": " prefix comes first, with no alternatives
+					content = json.dumps({"answer": answer})
+					prefix = [{"token": t, "logprob": 0.0} for t in ('{"', "answer", '":"')]
+					logprobs = [dict(t, top_logprobs=[t]) for t in prefix] + logprobs + [{"token": '"}', "logprob": 0.0, "top_logprobs": []}]
+				else:
+					content = answer
+
+		body = {
+			"model": model,
+			"created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+			"message": {"role": "assistant", "content": content},
+			"done": True,
+			"done_reason": "stop",
+			"total_duration": int((time.perf_counter() - start) * 1e9),
+		}
+		if logprobs is not None:
+			body["logprobs"] = logprobs
+		self.reply(body)
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description="Mock Ollama /api/chat server for the RQ3 cascade")
+	parser.add_argument("--port", type=int, default=11435)
+	parser.add_argument("--large", default="gemma3", help="model that always answers correctly")
+	parser.add_argument("--latency", action="append", default=[], metavar="MODEL=SECONDS",
+						help="per-call latency of a model (repeatable)")
+	parser.add_argument("--default-latency", type=float, default=0.05)
+	args = parser.parse_args(argv)
+	latency = {args.large: 0.4}
+	for item in args.latency:
+		model, _, seconds = item.rpartition("=")
+		latency[model] = float(seconds)
+	Handler.config = {"large": args.large, "latency": latency, "default_latency": args.default_latency}
+	server = ThreadingHTTPServer(("127.0.0.1", args.port), Handler)
+	print(f"Mock Ollama on http://127.0.0.1:{args.port} ({', '.join(f'{m}={s}s' for m, s in latency.items())})")
+	try:
+		server.serve_forever()
+	except KeyboardInterrupt:
+		pass
+
+
+if __name__ == "__main__":
+	sys.exit(main())